@@ -1,5 +1,7 @@
 """Configuration settings for DD Agent."""
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,6 +14,7 @@ class Settings(BaseSettings):
     AZURE_OPENAI_ENDPOINT: str = ""
     AZURE_OPENAI_API_KEY: str = ""
     AZURE_OPENAI_DEPLOYMENT: str = ""
+    AZURE_OPENAI_SMALL_DEPLOYMENT: str = ""  # Cheaper model for bounded tasks; empty uses AZURE_OPENAI_DEPLOYMENT
     AZURE_OPENAI_API_VERSION: str = "2024-08-01-preview"
 
     # API Mode
@@ -20,6 +23,16 @@ class Settings(BaseSettings):
     # LLM Settings
     LLM_TEMPERATURE: float = 0.0
     LLM_TIMEOUT_S: float = 60.0
+    LLM_RESPONSE_CACHE_SIZE: int = 256  # Responses kept in memory; 0 disables
+
+    # Pipeline Settings
+    DD_CUT_CONCURRENCY: int = 4
+    DD_BATCH_PLANNING: bool = False
+    DD_PLAN_CACHE: bool = False
+    DD_TEMPLATE_CACHE: bool = False
+    DD_PARQUET_CACHE: bool = False
+    DD_TABLE_FORMAT: Literal["csv", "parquet"] = "csv"
+    DD_KEYWORD_PLANNER: bool = False
 
     @property
     def is_configured(self) -> bool:
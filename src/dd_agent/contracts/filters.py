@@ -4,6 +4,8 @@ from typing import Annotated, Literal, Union
 
 from pydantic import BaseModel, Field
 
+from dd_agent.contracts.questions import InternedStr
+
 
 # ============================================================================
 # Predicates (leaf nodes)
@@ -14,7 +16,7 @@ class PredicateEq(BaseModel):
     """Equality predicate: question value equals a specific value."""
 
     kind: Literal["eq"] = "eq"
-    question_id: str = Field(..., description="The question to filter on")
+    question_id: InternedStr = Field(..., description="The question to filter on")
     value: str | int = Field(..., description="The value to match")
 
 
@@ -22,7 +24,7 @@ class PredicateIn(BaseModel):
     """In predicate: question value is one of the specified values."""
 
     kind: Literal["in"] = "in"
-    question_id: str = Field(..., description="The question to filter on")
+    question_id: InternedStr = Field(..., description="The question to filter on")
     values: list[str | int] = Field(..., description="The values to match (any of)")
 
 
@@ -30,7 +32,7 @@ class PredicateRange(BaseModel):
     """Range predicate: question value is within a numeric range."""
 
     kind: Literal["range"] = "range"
-    question_id: str = Field(..., description="The question to filter on")
+    question_id: InternedStr = Field(..., description="The question to filter on")
     min: float | int = Field(..., description="Minimum value")
     max: float | int = Field(..., description="Maximum value")
     inclusive: bool = Field(default=True, description="Whether bounds are inclusive")
@@ -44,7 +46,7 @@ class PredicateContainsAny(BaseModel):
     """
 
     kind: Literal["contains_any"] = "contains_any"
-    question_id: str = Field(..., description="The question to filter on")
+    question_id: InternedStr = Field(..., description="The question to filter on")
     values: list[str | int] = Field(
         ..., description="At least one of these values must be present"
     )
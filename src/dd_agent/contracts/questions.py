@@ -1,9 +1,15 @@
 """Question-related contracts."""
 
+import sys
 from enum import Enum
-from typing import Optional
+from typing import Annotated, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, BaseModel, Field
+
+# Question/segment IDs are interned when a model is validated, so the many
+# dict lookups keyed by ID (catalogs, column maps, mask caches) compare
+# identical strings by pointer instead of by content.
+InternedStr = Annotated[str, AfterValidator(sys.intern)]
 
 
 class QuestionType(str, Enum):
@@ -28,7 +34,7 @@ class Option(BaseModel):
 class Question(BaseModel):
     """A survey question definition."""
 
-    question_id: str = Field(..., description="Unique identifier for this question")
+    question_id: InternedStr = Field(..., description="Unique identifier for this question")
     label: str = Field(..., description="The question text/label")
     type: QuestionType = Field(..., description="The type of question")
     options: Optional[list[Option]] = Field(
@@ -5,12 +5,13 @@ from typing import Literal, Optional
 from pydantic import BaseModel, Field
 
 from dd_agent.contracts.filters import FilterExpr
+from dd_agent.contracts.questions import InternedStr
 
 
 class SegmentSpec(BaseModel):
     """Specification for a respondent segment."""
 
-    segment_id: str = Field(..., description="Unique identifier for this segment")
+    segment_id: InternedStr = Field(..., description="Unique identifier for this segment")
     name: str = Field(..., description="Human-readable name for the segment")
     definition: FilterExpr = Field(
         ..., description="Filter expression defining segment membership"
@@ -30,7 +31,7 @@ class MetricSpec(BaseModel):
     type: Literal["frequency", "mean", "top2box", "bottom2box", "nps"] = Field(
         ..., description="The type of metric to compute"
     )
-    question_id: str = Field(..., description="The question to compute the metric on")
+    question_id: InternedStr = Field(..., description="The question to compute the metric on")
     params: dict = Field(
         default_factory=dict,
         description="Additional parameters for the metric (e.g., top_values for top2box)",
@@ -43,7 +44,7 @@ class DimensionSpec(BaseModel):
     kind: Literal["question", "segment"] = Field(
         ..., description="Whether this dimension is a question or segment"
     )
-    id: str = Field(..., description="The question_id or segment_id")
+    id: InternedStr = Field(..., description="The question_id or segment_id")
 
 
 class CutSpec(BaseModel):
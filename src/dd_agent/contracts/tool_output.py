@@ -17,12 +17,19 @@ class ToolMessage(BaseModel):
         description="Additional context for debugging",
     )
 
+    def to_message(self) -> str:
+        """Get the human-readable message."""
+        return self.message
+
 
 class ToolOutput(BaseModel, Generic[T]):
     """Standard output envelope for all tools.
 
     This provides a consistent interface for tool results, making it easy
     to handle success/failure cases and trace execution.
+
+    The ``success``/``failure``/``partial_for_user_input`` constructors skip
+    validation: envelopes are built internally from already-typed values.
     """
 
     ok: bool = Field(..., description="Whether the tool execution was successful")
@@ -53,13 +60,13 @@ class ToolOutput(BaseModel, Generic[T]):
         trace: Optional[Dict[str, Any]] = None
     ) -> "ToolOutput[T]":
         """Create a partial result that requires user input."""
-        return cls(
+        return cls.model_construct(
             ok=False,
             data=None,
             requires_user_input=True,
             user_input_prompt=prompt,
             user_input_options=options,
-            trace=trace or {}
+            trace=trace or {},
         )
 
 
@@ -71,7 +78,7 @@ class ToolOutput(BaseModel, Generic[T]):
         trace: Optional[dict[str, Any]] = None,
     ) -> "ToolOutput[T]":
         """Create a successful tool output."""
-        return cls(
+        return cls.model_construct(
             ok=True,
             data=data,
             warnings=warnings or [],
@@ -86,7 +93,7 @@ class ToolOutput(BaseModel, Generic[T]):
         trace: Optional[dict[str, Any]] = None,
     ) -> "ToolOutput[T]":
         """Create a failed tool output."""
-        return cls(
+        return cls.model_construct(
             ok=False,
             data=None,
             errors=errors,
@@ -97,9 +104,9 @@ class ToolOutput(BaseModel, Generic[T]):
 
 def err(code: str, message: str, **context: Any) -> ToolMessage:
     """Helper to create an error message."""
-    return ToolMessage(code=code, message=message, context=context)
+    return ToolMessage.model_construct(code=code, message=message, context=context)
 
 
 def warn(code: str, message: str, **context: Any) -> ToolMessage:
     """Helper to create a warning message."""
-    return ToolMessage(code=code, message=message, context=context)
+    return ToolMessage.model_construct(code=code, message=message, context=context)
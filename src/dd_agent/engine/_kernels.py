@@ -0,0 +1,58 @@
+"""Grouped reduction kernels for the executor's cross-tab fast path.
+
+Numba is used when installed (``pip install dd-agent[fast]``); otherwise
+the kernels fall back to NumPy.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Optional dependency
+    njit = None
+
+
+def _group_sums_loop(
+    codes: np.ndarray,
+    flags: np.ndarray,
+    n_groups: int,
+) -> np.ndarray:
+    """Sum each row of ``flags`` per group code in a single pass.
+
+    Args:
+        codes: Group code per row; -1 marks rows in no group
+        flags: Float array of shape (n_flags, n_rows)
+        n_groups: Number of groups
+
+    Returns:
+        Array of shape (n_flags, n_groups) with per-group sums
+    """
+    out = np.zeros((flags.shape[0], n_groups))
+    for i in range(codes.shape[0]):
+        code = codes[i]
+        if code >= 0:
+            for j in range(flags.shape[0]):
+                out[j, code] += flags[j, i]
+    return out
+
+
+def _group_sums_numpy(
+    codes: np.ndarray,
+    flags: np.ndarray,
+    n_groups: int,
+) -> np.ndarray:
+    """Sum each row of ``flags`` per group code with np.bincount."""
+    in_group = codes >= 0
+    group_codes = codes[in_group]
+    out = np.zeros((flags.shape[0], n_groups))
+    for j in range(flags.shape[0]):
+        out[j] = np.bincount(
+            group_codes, weights=flags[j, in_group], minlength=n_groups
+        )
+    return out
+
+
+if njit is not None:
+    group_sums = njit(cache=True)(_group_sums_loop)
+else:
+    group_sums = _group_sums_numpy
@@ -1,12 +1,16 @@
 """Deterministic execution engine for analysis cuts."""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field
 
 from dd_agent.contracts.filters import FilterExpr
 from dd_agent.contracts.questions import Question, QuestionType
 from dd_agent.contracts.specs import CutSpec, DimensionSpec, SegmentSpec
+from dd_agent.engine._kernels import group_sums
 from dd_agent.engine.masks import build_mask
 from dd_agent.engine.metrics import (
     compute_bottom2box,
@@ -47,6 +51,7 @@ class Executor:
         segments_by_id: Optional[dict[str, SegmentSpec]] = None,
         min_base_size: int = 30,
         warn_base_size: int = 100,
+        max_workers: Optional[int] = None,
     ):
         """Initialize the executor.
 
@@ -56,68 +61,153 @@ class Executor:
             segments_by_id: Segment definitions (optional)
             min_base_size: Minimum base size threshold
             warn_base_size: Warning base size threshold
+            max_workers: Threads used to execute cuts (defaults to CPU count)
         """
         self.df = df
         self.questions_by_id = questions_by_id
         self.segments_by_id = segments_by_id or {}
         self.min_base_size = min_base_size
         self.warn_base_size = warn_base_size
+        self.max_workers = max_workers or os.cpu_count() or 1
 
-        # Pre-computed segment masks
-        self._segment_masks: dict[str, pd.Series] = {}
+        # Pre-computed segment masks as boolean arrays aligned to self.df rows.
+        # Complements are not stored; use ~mask where needed.
+        self._segment_masks: dict[str, np.ndarray] = {}
         self._segments_materialized = False
         
         # Materialize segments on first use, not in init
         # This avoids wasting computation if no cuts use segments
 
+        # Filter masks keyed by filter expression, shared across cuts
+        self._filter_mask_cache: dict[Any, pd.Series] = {}
+
+        # Column values as NumPy arrays, filled on first use
+        self._col_arrays: dict[str, np.ndarray] = {}
+
+        # Parsed multi-choice cells per question, shared across cuts and groups
+        self._mc_token_cache: dict[str, dict[Any, list[str]]] = {}
+
+        # Dimension columns factorized over all rows, shared across cuts
+        self._dim_codes: dict[str, tuple[np.ndarray, pd.Index]] = {}
+
     def materialize_segments(self) -> dict[str, int]:
         """Pre-compute masks for all segments."""
-        if self._segments_materialized:
-            # Return cached base sizes
-            return {seg_id: int(mask.sum()) for seg_id, mask in self._segment_masks.items()}
-        
+        if not self._segments_materialized:
+            for seg_id, segment_spec in self.segments_by_id.items():
+                # Build mask on the full DataFrame
+                mask = build_mask(self.df, segment_spec.definition, self.questions_by_id)
+                self._segment_masks[seg_id] = mask.to_numpy(dtype=bool)
+            self._segments_materialized = True
+
+        # Base sizes for each segment and its complement
+        n_rows = len(self.df)
         segment_bases = {}
-        
-        for seg_id, segment_spec in self.segments_by_id.items():
-            # Build mask on the full DataFrame
-            mask = build_mask(self.df, segment_spec.definition, self.questions_by_id)
-            self._segment_masks[seg_id] = mask
-            
-            # Calculate base size
+        for seg_id, mask in self._segment_masks.items():
             segment_bases[seg_id] = int(mask.sum())
-            
-            # Also compute complement mask for dimension comparisons
-            complement_id = f"not_{seg_id}"
-            self._segment_masks[complement_id] = ~mask
-            segment_bases[complement_id] = int((~mask).sum())
-        
-        self._segments_materialized = True
+            segment_bases[f"not_{seg_id}"] = n_rows - segment_bases[seg_id]
         return segment_bases
 
     def execute_cuts(self, cuts: list[CutSpec]) -> ExecutionResult:
         """Execute all cuts and return results.
 
+        Cuts are grouped by filter so each filtered frame is materialized
+        once, and groups run most-selective first. The per-cut metric work
+        runs on a thread pool (pandas reductions release the GIL). Tables
+        and errors are still reported in the order the cuts were given.
+
         Args:
             cuts: List of validated cut specifications
 
         Returns:
             ExecutionResult with tables and any errors
         """
-        result = ExecutionResult()
+        result = ExecutionResult.model_construct()
+        outcomes: list[Any] = [None] * len(cuts)
+
+        # Segment masks are shared by worker threads, so build them up front
+        if self.segments_by_id and not self._segments_materialized:
+            if any(self._uses_segments(cut) for cut in cuts):
+                self.materialize_segments()
 
-        for cut in cuts:
+        # Group cuts that share the same filter
+        buckets: dict[Any, list[int]] = {}
+        for i, cut in enumerate(cuts):
+            buckets.setdefault(self._filter_key(cut.filter), []).append(i)
+
+        # Build each group's mask once
+        bucket_masks: dict[Any, Optional[pd.Series]] = {}
+        for key, indices in buckets.items():
             try:
-                table_result = self._execute_single_cut(cut)
-                result.tables.append(table_result)
+                bucket_masks[key] = self._get_cut_mask(cuts[indices[0]])
             except Exception as e:
-                result.errors.append({
-                    "cut_id": cut.cut_id,
-                    "error": str(e),
-                    "type": type(e).__name__,
-                })
+                for i in indices:
+                    outcomes[i] = self._execution_error(cuts[i], e)
+
+        # Smallest filtered frames first
+        tasks: list[tuple[int, pd.DataFrame, Optional[pd.Series]]] = []
+        for key in sorted(bucket_masks, key=lambda k: self._mask_size(bucket_masks[k])):
+            mask = bucket_masks[key]
+            indices = buckets[key]
+
+            if mask is None:
+                # Unfiltered: metric functions only read, so no copy is needed
+                filtered_df = self.df
+            else:
+                needed_cols: list[str] = []
+                for i in indices:
+                    for col in self._needed_columns(cuts[i]):
+                        if col not in needed_cols:
+                            needed_cols.append(col)
+                filtered_df = self.df.loc[mask, needed_cols]
+
+            for i in indices:
+                tasks.append((i, filtered_df, mask))
+
+        if len(tasks) <= 1 or self.max_workers <= 1:
+            for i, filtered_df, mask in tasks:
+                try:
+                    outcomes[i] = self._execute_cut_given_filtered(
+                        cuts[i], filtered_df, mask
+                    )
+                except Exception as e:
+                    outcomes[i] = self._execution_error(cuts[i], e)
+        else:
+            workers = min(self.max_workers, len(tasks))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    (i, pool.submit(
+                        self._execute_cut_given_filtered, cuts[i], filtered_df, mask
+                    ))
+                    for i, filtered_df, mask in tasks
+                ]
+                for i, future in futures:
+                    try:
+                        outcomes[i] = future.result()
+                    except Exception as e:
+                        outcomes[i] = self._execution_error(cuts[i], e)
+
+        for outcome in outcomes:
+            if isinstance(outcome, TableResult):
+                result.tables.append(outcome)
+            else:
+                result.errors.append(outcome)
 
         return result
 
+    def _uses_segments(self, cut: CutSpec) -> bool:
+        """Check whether a cut reads any segment mask."""
+        if isinstance(cut.filter, str) and cut.filter in self.segments_by_id:
+            return True
+        return any(dim.kind == "segment" for dim in cut.dimensions)
+
+    def _execution_error(self, cut: CutSpec, e: Exception) -> dict[str, Any]:
+        """Build the error record for a cut that failed to execute."""
+        return {
+            "cut_id": cut.cut_id,
+            "error": str(e),
+            "type": type(e).__name__,
+        }
+
     def _execute_single_cut(self, cut: CutSpec) -> TableResult:
         """Execute a single cut specification.
 
@@ -127,48 +217,101 @@ class Executor:
         Returns:
             TableResult with computed metrics
         """
-        # Start with all rows
-        mask = pd.Series(True, index=self.df.index)
-
-        # Apply cut filter if present
-        if cut.filter is not None:
-            if isinstance(cut.filter, str):
-                # String could be a segment ID
-                if cut.filter in self.segments_by_id:
-                    # Materialize segments if needed
-                    if not self._segments_materialized:
-                        self.materialize_segments()
-                    
-                    # Use pre-computed mask
-                    if cut.filter in self._segment_masks:
-                        mask = self._segment_masks[cut.filter]
-                    else:
-                        # Compute dynamically
-                        mask = build_mask(self.df, 
-                                         self.segments_by_id[cut.filter].definition,
-                                         self.questions_by_id)
+        mask = self._get_cut_mask(cut)
+        if mask is None:
+            filtered_df = self.df
+        else:
+            filtered_df = self.df.loc[mask, self._needed_columns(cut)]
+        return self._execute_cut_given_filtered(cut, filtered_df, mask)
+
+    def _mask_size(self, mask: Optional[pd.Series]) -> int:
+        """Count the rows selected by a cut mask (None selects all rows)."""
+        if mask is None:
+            return len(self.df)
+        return int(mask.sum())
+
+    def _get_cut_mask(self, cut: CutSpec) -> Optional[pd.Series]:
+        """Resolve the row mask selected by a cut's filter.
+
+        Returns None when the cut has no filter, meaning all rows.
+        """
+        if cut.filter is None:
+            return None
+
+        # Apply cut filter
+        if isinstance(cut.filter, str):
+            # String could be a segment ID
+            if cut.filter in self.segments_by_id:
+                # Materialize segments if needed
+                if not self._segments_materialized:
+                    self.materialize_segments()
+                
+                # Use pre-computed mask
+                if cut.filter in self._segment_masks:
+                    mask = pd.Series(
+                        self._segment_masks[cut.filter],
+                        index=self.df.index,
+                        copy=False,
+                    )
                 else:
-                    # Try to treat as a simple column filter
-                    # Example: "Q1 == 'value'"
-                    try:
-                        # Evaluate the filter expression
-                        filtered_mask = self.df.eval(cut.filter)
-                        mask = mask & filtered_mask
-                    except:
-                        raise ValueError(f"Could not parse filter string: {cut.filter}")
+                    # Compute dynamically
+                    mask = build_mask(self.df, 
+                                      self.segments_by_id[cut.filter].definition,
+                                      self.questions_by_id)
             else:
-                # Regular filter expression
-                filter_mask = build_mask(self.df, cut.filter, self.questions_by_id)
-                mask = mask & filter_mask
+                # Try to treat as a simple column filter
+                # Example: "Q1 == 'value'"
+                mask = self._get_filter_mask(cut.filter)
+        else:
+            # Regular filter expression
+            mask = self._get_filter_mask(cut.filter)
 
-        # Get the filtered DataFrame
-        filtered_df = self.df[mask].copy()
+        return mask
 
-        # Get the question for the metric
+    def _metric_column(self, cut: CutSpec) -> tuple[Optional[Question], str]:
+        """Get the metric question and its DataFrame column name."""
         question = self.questions_by_id.get(cut.metric.question_id)
         col_name = cut.metric.question_id
         if question is not None:
             col_name = question.effective_column_name
+        return question, col_name
+
+    def _needed_columns(self, cut: CutSpec) -> list[str]:
+        """Get the existing columns a cut reads (metric + question dimension).
+
+        Metric functions only read the frame, so projecting these columns
+        avoids copying the full DataFrame.
+        """
+        _, col_name = self._metric_column(cut)
+        needed_cols = []
+        if col_name in self.df.columns:
+            needed_cols.append(col_name)
+        if cut.dimensions and cut.dimensions[0].kind == "question":
+            dim_question = self.questions_by_id.get(cut.dimensions[0].id)
+            if dim_question is not None:
+                dim_col = dim_question.effective_column_name
+                if dim_col in self.df.columns and dim_col not in needed_cols:
+                    needed_cols.append(dim_col)
+        return needed_cols
+
+    def _execute_cut_given_filtered(
+        self,
+        cut: CutSpec,
+        filtered_df: pd.DataFrame,
+        mask: Optional[pd.Series],
+    ) -> TableResult:
+        """Execute a cut against an already-filtered DataFrame.
+
+        Args:
+            cut: The cut specification to execute
+            filtered_df: Rows selected by the cut's filter
+            mask: The filter mask over the full DataFrame (None for all rows)
+
+        Returns:
+            TableResult with computed metrics
+        """
+        # Get the question for the metric
+        question, col_name = self._metric_column(cut)
 
         # Check if column exists
         if col_name not in filtered_df.columns:
@@ -177,22 +320,92 @@ class Executor:
         # Execute based on dimensions
         if not cut.dimensions:
             # Simple metric (no cross-tabulation)
-            return self._compute_metric_simple(cut, filtered_df, question, col_name)
+            series = self._get_series(col_name, mask, filtered_df)
+            return self._compute_metric_simple(cut, series, question)
         else:
             # Cross-tabulated metric
             return self._compute_metric_with_dimensions(
                 cut, filtered_df, question, col_name, mask
             )
 
+    def _filter_key(self, cut_filter: Optional[FilterExpr | str]) -> Any:
+        """Get a hashable key identifying a cut filter."""
+        if cut_filter is None:
+            return ("all",)
+        if isinstance(cut_filter, str):
+            if cut_filter in self.segments_by_id:
+                return ("segment", cut_filter)
+            return ("eval", cut_filter)
+        return ("expr", cut_filter.model_dump_json())
+
+    def _get_filter_mask(self, cut_filter: FilterExpr | str) -> pd.Series:
+        """Build the mask for a cut filter, reusing it across cuts.
+
+        Args:
+            cut_filter: A filter expression or a pandas query string
+
+        Returns:
+            Boolean Series aligned with the responses DataFrame
+        """
+        key = self._filter_key(cut_filter)
+        mask = self._filter_mask_cache.get(key)
+        if mask is not None:
+            return mask
+
+        if isinstance(cut_filter, str):
+            try:
+                # Evaluate the filter expression
+                mask = self._eval_filter_string(cut_filter)
+            except (
+                SyntaxError,
+                ValueError,
+                KeyError,
+                pd.errors.UndefinedVariableError,
+            ) as e:
+                raise ValueError(f"Could not parse filter string: {cut_filter}") from e
+        else:
+            mask = build_mask(self.df, cut_filter, self.questions_by_id)
+
+        self._filter_mask_cache[key] = mask
+        return mask
+
+    def _eval_filter_string(self, expr: str) -> pd.Series:
+        """Evaluate a pandas query string, preferring the numexpr engine."""
+        try:
+            return self.df.eval(expr, engine="numexpr")
+        except (ImportError, NotImplementedError, TypeError):
+            # numexpr missing or unable to handle the expression
+            return self.df.eval(expr, engine="python")
+
+    def _get_series(
+        self,
+        col_name: str,
+        mask: Optional[pd.Series],
+        filtered_df: pd.DataFrame,
+    ) -> pd.Series:
+        """Get a column's filtered values, indexing its cached array directly.
+
+        Extension dtypes (categorical, nullable) keep the pandas path so
+        their semantics are preserved.
+        """
+        arr = self._col_arrays.get(col_name)
+        if arr is None:
+            column = self.df[col_name]
+            if not isinstance(column.dtype, np.dtype):
+                return filtered_df[col_name]
+            arr = column.to_numpy()
+            self._col_arrays[col_name] = arr
+        if mask is None:
+            return pd.Series(arr, name=col_name, copy=False)
+        return pd.Series(arr[mask.to_numpy(dtype=bool)], name=col_name, copy=False)
+
     def _compute_metric_simple(
         self,
         cut: CutSpec,
-        df: pd.DataFrame,
+        series: pd.Series,
         question: Optional[Question],
-        col_name: str,
     ) -> TableResult:
         """Compute a simple metric without dimensions."""
-        series = df[col_name]
         base_n = int(series.notna().sum())
         warnings = add_base_size_warnings(base_n, self.min_base_size, self.warn_base_size)
 
@@ -202,7 +415,13 @@ class Executor:
         if metric_type == "frequency":
             # Check for multi-choice
             if question is not None and question.type == QuestionType.multi_choice:
-                freq_df = compute_multi_choice_frequency(series, question)
+                freq_df = compute_multi_choice_frequency(
+                    series,
+                    question,
+                    token_cache=self._mc_token_cache.setdefault(
+                        question.question_id, {}
+                    ),
+                )
             else:
                 freq_df = compute_frequency(series, question)
 
@@ -229,7 +448,7 @@ class Executor:
         else:
             raise ValueError(f"Unknown metric type: {metric_type}")
 
-        result = TableResult(
+        result = TableResult.model_construct(
             cut_id=cut.cut_id,
             metric_type=metric_type,
             question_id=cut.metric.question_id,
@@ -238,11 +457,11 @@ class Executor:
             warnings=warnings,
         )
         
-        # Set the internal dataframe representation
+        # Set the internal dataframe representation (built on first access)
         if metric_type == "frequency" and "distribution" in result_data:
-            result.set_dataframe(pd.DataFrame(result_data["distribution"]))
+            result.set_dataframe(lambda: pd.DataFrame(result_data["distribution"]))
         else:
-            result.set_dataframe(pd.DataFrame([result_data]))
+            result.set_dataframe(lambda: pd.DataFrame([result_data]))
             
         return result
 
@@ -252,7 +471,7 @@ class Executor:
         df: pd.DataFrame,
         question: Optional[Question],
         col_name: str,
-        base_mask: pd.Series,
+        base_mask: Optional[pd.Series],
     ) -> TableResult:
         """Compute a metric with dimension cross-tabulation."""
         # For now, support single dimension
@@ -278,7 +497,8 @@ class Executor:
             dim_col = dim_question.effective_column_name
             if dim_col not in df.columns:
                 raise ValueError(f"Dimension column '{dim_col}' not found")
-            groups = df.groupby(dim_col)
+            # Group codes in first-appearance order; -1 marks missing keys
+            codes, labels = self._dimension_codes(dim_col, base_mask)
             
         elif dim.kind == "segment":
             # Segment dimension - handle specially
@@ -287,26 +507,26 @@ class Executor:
                 self.materialize_segments()
             
             if dim.id in self._segment_masks:
-                # Use pre-computed mask, but align it with the filtered dataframe
+                # Use pre-computed mask
                 full_mask = self._segment_masks[dim.id]
-                # Apply the base filter mask to get correct subset
-                segment_mask = full_mask[base_mask.index].fillna(False)
-                
-                groups = {
-                    f"{dim.id}": df[segment_mask],
-                    f"not_{dim.id}": df[~segment_mask],
-                }
             elif dim.id in self.segments_by_id:
-                # Compute mask on full df, then apply to filtered df
-                full_mask = build_mask(self.df, self.segments_by_id[dim.id].definition, self.questions_by_id)
-                segment_mask = full_mask[base_mask.index].fillna(False)
-                
-                groups = {
-                    f"{dim.id}": df[segment_mask],
-                    f"not_{dim.id}": df[~segment_mask],
-                }
+                # Compute mask on full df
+                full_mask = build_mask(
+                    self.df, self.segments_by_id[dim.id].definition, self.questions_by_id
+                ).to_numpy(dtype=bool)
             else:
                 raise ValueError(f"Segment dimension '{dim.id}' not found")
+
+            # Both masks are aligned to self.df rows, so restrict the segment
+            # mask to the filtered rows positionally instead of by label
+            if base_mask is None:
+                segment_mask = full_mask
+            else:
+                segment_mask = full_mask[base_mask.to_numpy(dtype=bool)]
+
+            # Code 0 is the segment, code 1 its complement
+            codes = (~segment_mask).astype(np.intp)
+            labels = [f"{dim.id}", f"not_{dim.id}"]
         else:
             raise ValueError(f"Unknown dimension kind: {dim.kind}")
 
@@ -314,7 +534,31 @@ class Executor:
         result_by_group: dict[str, Any] = {}
         base_sizes: dict[str, int] = {}
 
-        if isinstance(groups, pd.core.groupby.DataFrameGroupBy):
+        grouped = self._grouped_metric_values(
+            cut, df[col_name], question, codes, labels
+        )
+
+        if grouped is not None:
+            # Vectorized path: one pass over the codes for values and base sizes
+            for group_val, n_rows, base_n, value in grouped:
+                if n_rows == 0:
+                    result_by_group[str(group_val)] = None
+                    base_sizes[str(group_val)] = 0
+                    continue
+
+                base_sizes[str(group_val)] = base_n
+
+                group_warnings = add_base_size_warnings(
+                    base_n, self.min_base_size, self.warn_base_size
+                )
+                if group_warnings:
+                    warnings.extend(
+                        [f"[{group_val}] {w}" for w in group_warnings]
+                    )
+
+                result_by_group[str(group_val)] = value
+        elif dim.kind == "question":
+            groups = df.groupby(dim_col, sort=False, observed=True)
             # Question dimension groups
             for group_val, group_df in groups:
                 if group_df.empty:
@@ -323,7 +567,8 @@ class Executor:
                     continue
                     
                 series = group_df[col_name]
-                base_n = int(series.notna().sum())
+                notna = series.notna()
+                base_n = int(notna.sum())
                 base_sizes[str(group_val)] = base_n
 
                 group_warnings = add_base_size_warnings(
@@ -335,10 +580,15 @@ class Executor:
                     )
 
                 result_by_group[str(group_val)] = self._compute_metric_value(
-                    cut.metric.type, series, question, cut.metric.params
+                    cut.metric.type, series, question, cut.metric.params,
+                    notna=notna,
                 )
         else:
             # Dict-based groups (for segments or custom groupings)
+            groups = {
+                labels[0]: df[segment_mask],
+                labels[1]: df[~segment_mask],
+            }
             for group_val, group_df in groups.items():
                 if group_df.empty:
                     result_by_group[group_val] = None
@@ -346,7 +596,8 @@ class Executor:
                     continue
                     
                 series = group_df[col_name]
-                base_n = int(series.notna().sum())
+                notna = series.notna()
+                base_n = int(notna.sum())
                 base_sizes[group_val] = base_n
 
                 group_warnings = add_base_size_warnings(
@@ -356,7 +607,8 @@ class Executor:
                     warnings.extend([f"[{group_val}] {w}" for w in group_warnings])
 
                 result_by_group[group_val] = self._compute_metric_value(
-                    cut.metric.type, series, question, cut.metric.params
+                    cut.metric.type, series, question, cut.metric.params,
+                    notna=notna,
                 )
 
         total_base = sum(base_sizes.values())
@@ -366,7 +618,7 @@ class Executor:
             "base_sizes": base_sizes,
         }
 
-        result = TableResult(
+        result = TableResult.model_construct(
             cut_id=cut.cut_id,
             metric_type=cut.metric.type,
             question_id=cut.metric.question_id,
@@ -376,66 +628,214 @@ class Executor:
             warnings=warnings,
         )
         
-        # Set the internal dataframe representation
+        # Set the internal dataframe representation (built on first access)
         # For cross-tabs, we can flatten this into a more useful format
-        df_rows = []
-        for dim_val, val in result_by_group.items():
-            row = {
-                "dimension": dim.id,
-                "value": dim_val,
-                "metric": val,
-                "base_n": base_sizes.get(dim_val, 0)
-            }
-            df_rows.append(row)
-        result.set_dataframe(pd.DataFrame(df_rows))
+        def build_dataframe() -> pd.DataFrame:
+            dim_vals = list(result_by_group.keys())
+            return pd.DataFrame({
+                "dimension": [dim.id] * len(dim_vals),
+                "value": dim_vals,
+                "metric": list(result_by_group.values()),
+                "base_n": [base_sizes.get(v, 0) for v in dim_vals],
+            })
+
+        result.set_dataframe(build_dataframe)
         
         return result
 
+    def _dimension_codes(
+        self, dim_col: str, base_mask: Optional[pd.Series]
+    ) -> tuple[np.ndarray, pd.Index]:
+        """Get group codes and labels for a dimension column over filtered rows.
+
+        The column is factorized once over the full DataFrame; filtered rows
+        reuse those integer codes, renumbered into first-appearance order so
+        the result matches ``pd.factorize`` on the filtered column.
+        """
+        if dim_col not in self._dim_codes:
+            self._dim_codes[dim_col] = pd.factorize(self.df[dim_col], sort=False)
+        codes, labels = self._dim_codes[dim_col]
+        if base_mask is None:
+            return codes, labels
+
+        codes = codes[base_mask.to_numpy(dtype=bool)]
+        present, first_seen = np.unique(codes[codes >= 0], return_index=True)
+        order = present[np.argsort(first_seen, kind="stable")]
+        # One extra slot so that code -1 (missing) indexes the last entry
+        remap = np.full(len(labels) + 1, -1, dtype=np.intp)
+        remap[order] = np.arange(len(order), dtype=np.intp)
+        return remap[codes], labels.take(order)
+
+    def _grouped_metric_values(
+        self,
+        cut: CutSpec,
+        series: pd.Series,
+        question: Optional[Question],
+        codes: np.ndarray,
+        labels: Any,
+    ) -> Optional[list[tuple[Any, int, int, Any]]]:
+        """Compute a scalar metric for every dimension group in one pass.
+
+        ``codes`` assigns each row of ``series`` to a position in ``labels``
+        (-1 for rows in no group). Counts are summed per group in one pass
+        by the ``group_sums`` kernel. Covers mean, top2box, bottom2box and nps; returns None
+        when the metric needs the per-group path (frequency, or box values
+        that depend on each group's data), so the caller can fall back.
+
+        Returns:
+            List of (group label, row count, base size, metric value) in
+            label order
+        """
+        metric_type = cut.metric.type
+        params = cut.metric.params
+        if metric_type not in ("mean", "top2box", "bottom2box", "nps"):
+            return None
+
+        try:
+            numeric = pd.to_numeric(series, errors="coerce").to_numpy(
+                dtype=float, na_value=np.nan
+            )
+            valid = ~np.isnan(numeric)
+
+            codes = codes.astype(np.int64, copy=False)
+            n_groups = len(labels)
+            metric_flags: list[np.ndarray] = []
+
+            if metric_type == "nps":
+                promoter_min = params.get("promoter_min", 9)
+                detractor_max = params.get("detractor_max", 6)
+                metric_flags = [numeric >= promoter_min, numeric <= detractor_max]
+            elif metric_type in ("top2box", "bottom2box"):
+                box_values = self._box_values(metric_type, question, params)
+                if box_values is None:
+                    return None
+                metric_flags = [np.isin(numeric, box_values)]
+
+            # One fused pass: rows, non-null base, numeric total, metric hits
+            flags = np.vstack(
+                [np.ones_like(valid), series.notna().to_numpy(), valid]
+                + metric_flags
+            ).astype(np.float64)
+            sums = group_sums(codes, flags, n_groups)
+            row_counts, base_counts, totals = sums[0], sums[1], sums[2]
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if metric_type == "mean":
+                    # pandas' compensated summation keeps 4-decimal means stable
+                    in_group = codes >= 0
+                    values = (
+                        pd.Series(numeric[in_group])
+                        .groupby(codes[in_group])
+                        .mean()
+                        .reindex(range(n_groups))
+                        .to_numpy()
+                    )
+                    digits = 4
+                elif metric_type == "nps":
+                    promoters, detractors = sums[3], sums[4]
+                    values = promoters / totals * 100 - detractors / totals * 100
+                    digits = 2
+                else:
+                    values = sums[3] / totals * 100
+                    digits = 2
+        except (TypeError, ValueError):
+            # Values the vectorized path can't handle go through the metric functions
+            return None
+
+        return [
+            (
+                group_val,
+                int(n_rows),
+                int(base_n),
+                round(float(value), digits)
+                if total > 0 and not np.isnan(value)
+                else None,
+            )
+            for group_val, n_rows, base_n, value, total in zip(
+                labels, row_counts, base_counts, values, totals
+            )
+        ]
+
+    def _box_values(
+        self,
+        metric_type: str,
+        question: Optional[Question],
+        params: dict,
+    ) -> Optional[list]:
+        """Get the scale values counted by top2box/bottom2box, if data-independent."""
+        if metric_type == "top2box":
+            if params.get("top_values") is not None:
+                return params["top_values"]
+            if question is not None and question.type == QuestionType.likert_1_5:
+                return [4, 5]
+            if question is not None and question.type == QuestionType.likert_1_7:
+                return [6, 7]
+        else:
+            if params.get("bottom_values") is not None:
+                return params["bottom_values"]
+            if question is not None and question.type in (
+                QuestionType.likert_1_5,
+                QuestionType.likert_1_7,
+            ):
+                return [1, 2]
+        # Box values fall back to the top/bottom values observed in the data
+        return None
+
     def _compute_metric_value(
         self,
         metric_type: str,
         series: pd.Series,
         question: Optional[Question],
         params: dict,
+        notna: Optional[pd.Series] = None,
     ) -> Any:
-        """Compute a single metric value for a group."""
+        """Compute a single metric value for a group.
+
+        If the caller already has the group's non-null mask (for the base
+        size), pass it as ``notna`` so missing values are dropped once here
+        rather than rescanned by the metric function.
+        """
+        if notna is not None:
+            series = series[notna]
+
+        if metric_type not in ("frequency", "mean", "top2box", "bottom2box", "nps"):
+            raise ValueError(f"Unknown metric type: {metric_type}")
+
         if series.empty:
             # Handle empty groups gracefully
-            if metric_type in ["mean", "nps", "top2box", "bottom2box"]:
-                return None
-            elif metric_type == "frequency":
-                return []
-        
-        try:
             if metric_type == "frequency":
-                if question is not None and question.type == QuestionType.multi_choice:
-                    freq_df = compute_multi_choice_frequency(series, question)
-                else:
-                    freq_df = compute_frequency(series, question)
-                return freq_df.to_dict(orient="records")
+                return []
+            return None
 
-            elif metric_type == "mean":
-                result = compute_mean(series)
-                return result.get("mean")
+        if metric_type == "frequency":
+            if question is not None and question.type == QuestionType.multi_choice:
+                freq_df = compute_multi_choice_frequency(
+                    series,
+                    question,
+                    token_cache=self._mc_token_cache.setdefault(
+                        question.question_id, {}
+                    ),
+                )
+            else:
+                freq_df = compute_frequency(series, question)
+            return freq_df.to_dict(orient="records")
 
-            elif metric_type == "top2box":
-                result = compute_top2box(series, question, params.get("top_values"))
-                return result.get("top2box_pct")
+        elif metric_type == "mean":
+            result = compute_mean(series)
+            return result.get("mean")
 
-            elif metric_type == "bottom2box":
-                result = compute_bottom2box(series, question, params.get("bottom_values"))
-                return result.get("bottom2box_pct")
+        elif metric_type == "top2box":
+            result = compute_top2box(series, question, params.get("top_values"))
+            return result.get("top2box_pct")
 
-            elif metric_type == "nps":
-                result = compute_nps(
-                    series,
-                    params.get("promoter_min", 9),
-                    params.get("detractor_max", 6),
-                )
-                return result.get("nps")
+        elif metric_type == "bottom2box":
+            result = compute_bottom2box(series, question, params.get("bottom_values"))
+            return result.get("bottom2box_pct")
 
-            else:
-                raise ValueError(f"Unknown metric type: {metric_type}")
-        except Exception as e:
-            # Gracefully handle computation errors
-            return None
\ No newline at end of file
+        else:
+            result = compute_nps(
+                series,
+                params.get("promoter_min", 9),
+                params.get("detractor_max", 6),
+            )
+            return result.get("nps")
\ No newline at end of file
@@ -275,6 +275,7 @@ def compute_multi_choice_frequency(
     series: pd.Series,
     question: Optional[Question] = None,
     separator: str = ";",
+    token_cache: Optional[dict[Any, list[str]]] = None,
 ) -> pd.DataFrame:
     """Compute frequency for multi-choice questions.
 
@@ -285,26 +286,35 @@ def compute_multi_choice_frequency(
         series: The data series with semicolon-separated values
         question: Optional question for label lookup
         separator: The separator character (default: ;)
+        token_cache: Optional dict of parsed cells, reused across calls
+            on the same column
 
     Returns:
         DataFrame with columns: value, label, count, percentage
     """
-    # Explode multi-choice into individual responses
-    all_values = []
-    total_respondents = 0
-
-    for cell in series:
-        if pd.notna(cell) and cell is not None:
-            total_respondents += 1
-            cell_str = str(cell)
-            values = [v.strip() for v in cell_str.split(separator) if v.strip()]
-            all_values.extend(values)
-
-    if not all_values:
+    # Each distinct cell is parsed once and weighted by how often it occurs.
+    # Cells are visited in first-appearance order so ties keep row order.
+    cell_counts = series.value_counts(dropna=True, sort=False)
+    total_respondents = int(cell_counts.sum())
+    if token_cache is None:
+        token_cache = {}
+
+    option_counts: dict[str, int] = {}
+    for cell, n in cell_counts.items():
+        values = token_cache.get(cell)
+        if values is None:
+            values = [v.strip() for v in str(cell).split(separator) if v.strip()]
+            token_cache[cell] = values
+        for value in values:
+            option_counts[value] = option_counts.get(value, 0) + int(n)
+
+    if not option_counts:
         return pd.DataFrame(columns=["value", "label", "count", "percentage"])
 
     # Count occurrences
-    value_counts = pd.Series(all_values).value_counts()
+    value_counts = pd.Series(
+        list(option_counts.values()), index=list(option_counts.keys())
+    ).sort_values(ascending=False)
 
     # Build result DataFrame
     data = []
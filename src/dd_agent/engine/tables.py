@@ -1,6 +1,6 @@
 """Table result models and utilities."""
 
-from typing import Any, Optional
+from typing import Any, Callable, Optional, Union
 
 import pandas as pd
 from pydantic import BaseModel, Field
@@ -33,14 +33,28 @@ class TableResult(BaseModel):
 
     # Optional DataFrame for complex results (not serialized to JSON)
     _df: Optional[pd.DataFrame] = None
-
-    def set_dataframe(self, df: pd.DataFrame) -> None:
-        """Store the result DataFrame."""
-        object.__setattr__(self, "_df", df)
+    _df_factory: Optional[Callable[[], pd.DataFrame]] = None
+
+    def set_dataframe(
+        self, df: Union[pd.DataFrame, Callable[[], pd.DataFrame]]
+    ) -> None:
+        """Store the result DataFrame, or a callable that builds it on first use."""
+        if callable(df) and not isinstance(df, pd.DataFrame):
+            object.__setattr__(self, "_df", None)
+            object.__setattr__(self, "_df_factory", df)
+        else:
+            object.__setattr__(self, "_df", df)
+            object.__setattr__(self, "_df_factory", None)
 
     def get_dataframe(self) -> Optional[pd.DataFrame]:
         """Get the result DataFrame if available."""
-        return getattr(self, "_df", None)
+        df = getattr(self, "_df", None)
+        if df is None:
+            factory = getattr(self, "_df_factory", None)
+            if factory is not None:
+                df = factory()
+                self.set_dataframe(df)
+        return df
 
     def to_csv(self) -> str:
         """Convert result to CSV string."""
@@ -4,6 +4,7 @@ This module provides a wrapper around the OpenAI Python SDK's Azure client,
 following the patterns from the OpenAI cookbook for Azure integration.
 """
 
+import threading
 from typing import Optional
 
 from openai import AzureOpenAI
@@ -12,6 +13,7 @@ from dd_agent.config import settings
 
 # Global client instance (lazy initialization)
 _client: Optional[AzureOpenAI] = None
+_client_lock = threading.Lock()
 
 
 def build_client() -> AzureOpenAI:
@@ -36,14 +38,18 @@ def build_client() -> AzureOpenAI:
 def get_client() -> AzureOpenAI:
     """Get the shared AzureOpenAI client instance.
 
-    Uses lazy initialization to create the client on first use.
+    Uses lazy initialization to create the client on first use. Planning
+    threads call this concurrently, so creation is locked: every call
+    shares one client and with it one pool of keep-alive connections.
 
     Returns:
         Shared AzureOpenAI client instance
     """
     global _client
     if _client is None:
-        _client = build_client()
+        with _client_lock:
+            if _client is None:
+                _client = build_client()
     return _client
 
 
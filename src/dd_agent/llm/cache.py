@@ -0,0 +1,86 @@
+"""In-memory cache of structured LLM responses.
+
+Identical requests (same messages, schema, deployment and temperature)
+reuse the earlier response instead of calling the LLM again.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+def response_cache_key(
+    messages: list[dict[str, str]],
+    schema_name: str,
+    deployment: str,
+    temperature: float,
+) -> str:
+    """Compute the cache key for a structured LLM request.
+
+    Args:
+        messages: Chat messages sent to the LLM
+        schema_name: Name of the response schema
+        deployment: Model deployment name
+        temperature: Sampling temperature
+
+    Returns:
+        SHA-256 hex digest
+    """
+    request = [messages, schema_name, deployment, temperature]
+    if orjson is not None:
+        payload = orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class ResponseCache:
+    """LRU cache of (response JSON text, trace) by request key.
+
+    Responses are kept as JSON text so every hit validates into a fresh
+    model instance; callers may mutate what they get back. Safe to use from
+    the planning worker threads.
+    """
+
+    def __init__(self, max_entries: int):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of responses kept; 0 disables caching
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple[str, dict[str, Any]]]:
+        """Get a cached (content, trace) pair, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, content: str, trace: dict[str, Any]) -> None:
+        """Store a response, evicting the least recently used past max_entries."""
+        if self.max_entries <= 0:
+            return
+        # Keep a private copy so callers can't change what later hits see
+        trace = copy.deepcopy(trace)
+        with self._lock:
+            self._entries[key] = (content, trace)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
@@ -6,38 +6,61 @@ using JSON Schema, ensuring the response matches the expected format.
 
 import json
 import time
-from typing import Any, Optional, Type, TypeVar
+from functools import lru_cache
+from typing import Any, Literal, Optional, Type, TypeVar
 
 from pydantic import BaseModel
 
 from dd_agent.config import settings
 from dd_agent.llm.azure_client import get_client
+from dd_agent.llm.cache import ResponseCache, response_cache_key
 from dd_agent.util.jsonschema import extract_json_schema_for_structured_output
 
 T = TypeVar("T", bound=BaseModel)
 
+ModelTier = Literal["default", "small"]
 
-def chat_structured(
+# Responses to identical structured requests, shared by all tools
+_response_cache = ResponseCache(settings.LLM_RESPONSE_CACHE_SIZE)
+
+
+@lru_cache(maxsize=None)
+def _structured_schema(model: Type[BaseModel]) -> dict[str, Any]:
+    """Get a model's structured output schema, generated once per model.
+
+    The returned dict is shared between calls and must not be mutated.
+    """
+    return extract_json_schema_for_structured_output(model)
+
+
+def resolve_deployment(
+    model_deployment: Optional[str] = None,
+    model_tier: ModelTier = "default",
+) -> str:
+    """Pick the deployment for a call.
+
+    An explicit deployment wins. The "small" tier uses
+    AZURE_OPENAI_SMALL_DEPLOYMENT when it is set; everything else uses
+    AZURE_OPENAI_DEPLOYMENT.
+    """
+    if model_deployment:
+        return model_deployment
+    if model_tier == "small" and settings.AZURE_OPENAI_SMALL_DEPLOYMENT:
+        return settings.AZURE_OPENAI_SMALL_DEPLOYMENT
+    return settings.AZURE_OPENAI_DEPLOYMENT
+
+
+def _chat_structured_raw(
     messages: list[dict[str, str]],
     schema_name: str,
     schema: dict[str, Any],
     model_deployment: Optional[str] = None,
     temperature: Optional[float] = None,
-) -> tuple[dict[str, Any], dict[str, Any]]:
-    """Call the LLM with a JSON schema for structured output.
-
-    Uses Azure OpenAI's structured outputs feature with response_format
-    set to json_schema with strict: true.
-
-    Args:
-        messages: List of chat messages
-        schema_name: Name for the schema
-        schema: JSON Schema dict
-        model_deployment: Azure deployment name (defaults to settings)
-        temperature: Temperature for generation (defaults to settings)
+) -> tuple[str, dict[str, Any]]:
+    """Call the LLM with a JSON schema and return the unparsed response.
 
     Returns:
-        Tuple of (parsed JSON response, trace info)
+        Tuple of (JSON response text, trace info)
     """
     client = get_client()
     deployment = model_deployment or settings.AZURE_OPENAI_DEPLOYMENT
@@ -61,9 +84,7 @@ def chat_structured(
 
     elapsed = time.time() - start_time
 
-    # Parse the response
     content = response.choices[0].message.content
-    parsed = json.loads(content)
 
     # Build trace info
     trace = {
@@ -78,7 +99,39 @@ def chat_structured(
         "finish_reason": response.choices[0].finish_reason,
     }
 
-    return parsed, trace
+    return content, trace
+
+
+def chat_structured(
+    messages: list[dict[str, str]],
+    schema_name: str,
+    schema: dict[str, Any],
+    model_deployment: Optional[str] = None,
+    temperature: Optional[float] = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Call the LLM with a JSON schema for structured output.
+
+    Uses Azure OpenAI's structured outputs feature with response_format
+    set to json_schema with strict: true.
+
+    Args:
+        messages: List of chat messages
+        schema_name: Name for the schema
+        schema: JSON Schema dict
+        model_deployment: Azure deployment name (defaults to settings)
+        temperature: Temperature for generation (defaults to settings)
+
+    Returns:
+        Tuple of (parsed JSON response, trace info)
+    """
+    content, trace = _chat_structured_raw(
+        messages=messages,
+        schema_name=schema_name,
+        schema=schema,
+        model_deployment=model_deployment,
+        temperature=temperature,
+    )
+    return json.loads(content), trace
 
 
 def chat_structured_pydantic(
@@ -86,35 +139,64 @@ def chat_structured_pydantic(
     model: Type[T],
     model_deployment: Optional[str] = None,
     temperature: Optional[float] = None,
+    model_tier: ModelTier = "default",
 ) -> tuple[T, dict[str, Any]]:
     """Call the LLM with a Pydantic model schema for structured output.
 
     This is a convenience wrapper that:
-    1. Extracts the JSON schema from the Pydantic model
-    2. Calls the LLM with structured output
-    3. Validates and returns the parsed model instance
+    1. Extracts the JSON schema from the Pydantic model (cached per model)
+    2. Calls the LLM with structured output, unless an identical request
+       was answered before (see LLM_RESPONSE_CACHE_SIZE)
+    3. Validates the response JSON and returns the model instance
 
     Args:
         messages: List of chat messages
         model: Pydantic model class to use for the schema
         model_deployment: Azure deployment name (defaults to settings)
         temperature: Temperature for generation (defaults to settings)
+        model_tier: "small" routes bounded tasks to the cheaper deployment
+            when one is configured (ignored if model_deployment is given)
 
     Returns:
         Tuple of (validated model instance, trace info)
     """
-    schema = extract_json_schema_for_structured_output(model)
-    parsed, trace = chat_structured(
+    deployment = resolve_deployment(model_deployment, model_tier)
+    temp = temperature if temperature is not None else settings.LLM_TEMPERATURE
+
+    # Identical requests reuse the earlier response
+    start_time = time.time()
+    key = response_cache_key(
+        messages, f"{model.__module__}.{model.__qualname__}", deployment, temp
+    )
+    cached = _response_cache.get(key)
+    if cached is not None:
+        content, cached_trace = cached
+        instance = model.model_validate_json(content)
+        # No LLM call was made: report the lookup time and no token usage
+        trace = {
+            "model": deployment,
+            "temperature": temp,
+            "latency_s": round(time.time() - start_time, 3),
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            "finish_reason": cached_trace.get("finish_reason"),
+            "cache": "hit",
+        }
+        return instance, trace
+
+    schema = _structured_schema(model)
+    content, trace = _chat_structured_raw(
         messages=messages,
         schema_name=model.__name__,
         schema=schema,
-        model_deployment=model_deployment,
-        temperature=temperature,
+        model_deployment=deployment,
+        temperature=temp,
     )
 
-    # Validate and create model instance
-    instance = model.model_validate(parsed)
+    # Validate straight from the JSON text, without building dicts first
+    instance = model.model_validate_json(content)
 
+    # Only cache responses that validated
+    _response_cache.put(key, content, trace)
     return instance, trace
 
 
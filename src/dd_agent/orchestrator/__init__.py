@@ -1,9 +1,19 @@
 """Orchestrator package."""
 
-from dd_agent.orchestrator.agent import Agent
+from typing import Any
+
 from dd_agent.orchestrator.pipeline import Pipeline
 
 __all__ = [
     "Agent",
     "Pipeline",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import Agent (and with it the LLM client) only when it is used."""
+    if name == "Agent":
+        from dd_agent.orchestrator.agent import Agent
+
+        return Agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -49,6 +49,10 @@ class Agent:
         self.segments: list[SegmentSpec] = []
         self.segments_by_id: dict[str, SegmentSpec] = {}
 
+        # Executor reused across execute_cuts calls so its mask caches stay warm
+        self._executor: Optional[Executor] = None
+        self._executor_sig: Optional[tuple[int, int]] = None
+
         # Initialize tools
         self.high_level_planner = HighLevelPlanner()
         self.cut_planner = CutPlanner()
@@ -114,6 +118,18 @@ class Agent:
         # Return the result directly (cut planner already validates)
         return cut_result
 
+    def plan_cuts(self, requests: list[str]) -> list[ToolOutput[CutSpec]]:
+        """Plan several cuts, sharing one LLM call where possible.
+
+        Args:
+            requests: Natural language analysis requests
+
+        Returns:
+            One ToolOutput per request, in the same order
+        """
+        contexts = [self._get_context(prompt=request) for request in requests]
+        return self.cut_planner.run_batch(contexts)
+
     def build_segment(self, definition: str) -> ToolOutput[SegmentSpec]:
         """Build a segment from a natural language definition.
 
@@ -146,6 +162,9 @@ class Agent:
         self.segments.append(segment)
         self.segments_by_id[segment.segment_id] = segment
 
+        # Cached segment masks are stale now
+        self._executor = None
+
     def execute_cuts(self, cuts: list[CutSpec]) -> ExecutionResult:
         """Execute a list of validated cut specifications.
 
@@ -155,17 +174,20 @@ class Agent:
         Returns:
             ExecutionResult with tables and any errors
         """
-        # Initialize the executor with current state
-        executor = Executor(
-            df=self.responses_df,
-            questions_by_id=self.questions_by_id,
-            segments_by_id=self.segments_by_id,
-            min_base_size=30,  # Default values
-            warn_base_size=100
-        )
+        # Reuse the executor unless the data or questions were replaced
+        sig = (id(self.responses_df), id(self.questions_by_id))
+        if self._executor is None or sig != self._executor_sig:
+            self._executor = Executor(
+                df=self.responses_df,
+                questions_by_id=self.questions_by_id,
+                segments_by_id=self.segments_by_id,
+                min_base_size=30,  # Default values
+                warn_base_size=100
+            )
+            self._executor_sig = sig
         
         # Execute all cuts
-        return executor.execute_cuts(cuts)
+        return self._executor.execute_cuts(cuts)
 
     def execute_single_cut(self, cut: CutSpec) -> ExecutionResult:
         """Execute a single cut specification.
@@ -1,47 +1,246 @@
 """Pipeline for running analysis flows."""
 
-import json
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
+from functools import cached_property
+from itertools import chain
 from pathlib import Path
-from typing import Any, Optional
-
-import pandas as pd
-from rich.console import Console  # 添加这一行
-
-from dd_agent.contracts.questions import Question
-from dd_agent.contracts.specs import CutSpec, HighLevelPlan, SegmentSpec
-from dd_agent.contracts.tool_output import ToolOutput
-from dd_agent.engine.executor import ExecutionResult
-from dd_agent.orchestrator.agent import Agent
-from dd_agent.run_store import RunStore
-from dd_agent.util.logging import get_logger
-
-logger = get_logger("pipeline")
-"""Pipeline for running analysis flows."""
-
-import json
-from dataclasses import dataclass, field
-from datetime import datetime
-from pathlib import Path
-from typing import Any, Optional
+from threading import Thread
+from typing import TYPE_CHECKING, Any, Callable, Optional
+from uuid import uuid4
 
+import numpy as np
 import pandas as pd
+from pydantic import BaseModel, Field, TypeAdapter
 from rich.console import Console
+from typing_extensions import NotRequired, TypedDict
 
+from dd_agent.config import settings
 from dd_agent.contracts.questions import Question
 from dd_agent.contracts.specs import CutSpec, HighLevelPlan, SegmentSpec
 from dd_agent.contracts.tool_output import ToolOutput, ToolMessage
 from dd_agent.engine.executor import ExecutionResult
-from dd_agent.orchestrator.agent import Agent
+from dd_agent.plan_cache import PlanCache, plan_fingerprint
 from dd_agent.run_store import RunStore
+from dd_agent.util.hashing import hash_dataset_cached
 from dd_agent.util.logging import get_logger
 
+if TYPE_CHECKING:
+    from dd_agent.orchestrator.agent import Agent
+
 logger = get_logger("pipeline")
 
 # Create global console object
 console = Console()
 
+# Write buffer for the pandas CSV fallback
+_CSV_BUFFER_SIZE = 1 << 20
+
+# Sort rank for named intent priorities
+_PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+# Validates a whole questions list in one pydantic-core call
+_QUESTIONS_ADAPTER = TypeAdapter(list[Question])
+
+
+class _QuestionsFile(TypedDict):
+    """questions.json in its {"questions": [...]} form."""
+
+    questions: NotRequired[list[Question]]
+
+
+_QUESTIONS_FILE_ADAPTER = TypeAdapter(_QuestionsFile)
+
+
+class _CachedCutPlan(BaseModel):
+    """A planned cut as stored in the plan cache, with its planner warnings."""
+
+    cut: CutSpec
+    warnings: list[ToolMessage] = Field(default_factory=list)
+
+# Parsed input files shared across Pipeline instances, keyed by
+# (path, size, mtime_ns) so that edits on disk invalidate the entry.
+# Least recently used entries are dropped past _FILE_CACHE_MAX_ENTRIES.
+_FILE_CACHE: OrderedDict[tuple[str, int, int], Any] = OrderedDict()
+_FILE_CACHE_MAX_ENTRIES = 8
+
+
+def _load_cached(path: Path, loader: Callable[[Path], Any]) -> Any:
+    """Load a file once per on-disk version and reuse the parsed result."""
+    stat = path.stat()
+    resolved = str(path.resolve())
+    key = (resolved, stat.st_size, stat.st_mtime_ns)
+    if key in _FILE_CACHE:
+        _FILE_CACHE.move_to_end(key)
+        return _FILE_CACHE[key]
+
+    # Drop entries for older versions of this file
+    for stale in [k for k in _FILE_CACHE if k[0] == resolved]:
+        del _FILE_CACHE[stale]
+    value = _FILE_CACHE[key] = loader(path)
+    while len(_FILE_CACHE) > _FILE_CACHE_MAX_ENTRIES:
+        _FILE_CACHE.popitem(last=False)
+    return value
+
+
+def _priority_rank(priority: Any) -> int:
+    """Rank an intent priority (1=high .. 3=low, or a priority name)."""
+    if isinstance(priority, int):
+        return min(max(priority - 1, 0), 3)
+    return _PRIORITY_RANK.get(priority, 3)
+
+
+def _order_intents(intents: list[Any]) -> list[Any]:
+    """Order intents by priority, keeping plan order within each priority.
+
+    A single pass into one bucket per rank, since there are only four.
+    """
+    buckets: list[list[Any]] = [[], [], [], []]
+    for intent in intents:
+        buckets[_priority_rank(intent.priority)].append(intent)
+    return [intent for bucket in buckets for intent in bucket]
+
+
+def _extract_errors(errors: list[ToolMessage]) -> list[str]:
+    """Get the human-readable text of tool errors."""
+    return [e.to_message() for e in errors]
+
+
+def _render_ambiguity_options(prompt: str, options: list[dict[str, Any]]) -> str:
+    """Build the interactive ambiguity menu as one Rich markup string."""
+    lines = [
+        "\n" + "=" * 60,
+        "[bold yellow]🤔 AMBIGUITY DETECTED[/bold yellow]",
+        "=" * 60,
+        f"Your request '[cyan]{prompt}[/cyan]' could mean multiple things:",
+        "",
+    ]
+    for i, option in enumerate(options):
+        lines += [
+            f"[bold]{i+1}.[/bold] {option.get('label', 'No label')}",
+            f"   [dim]Question ID: {option.get('question_id', 'UNKNOWN')}[/dim]",
+            f"   [dim]Match reason: {option.get('match_reason', 'No reason given')}[/dim]",
+            f"   [dim]Confidence: {option.get('confidence', 0.0):.1%}[/dim]",
+            "",
+        ]
+    lines += [
+        f"[bold]{len(options)+1}.[/bold] Enter a different request",
+        f"[bold]{len(options)+2}.[/bold] Cancel analysis",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def _read_responses_csv(path: Path) -> pd.DataFrame:
+    """Read responses.csv with the multi-threaded pyarrow parser if available.
+
+    Falls back to the C parser when pyarrow is missing or rejects the file,
+    and when pyarrow inferred timestamp columns (the C parser keeps those as
+    strings), so the loaded dtypes don't depend on which parser ran.
+    """
+    try:
+        df = pd.read_csv(path, engine="pyarrow")
+    except (ImportError, ValueError):
+        # pyarrow is optional; its parse errors (ArrowInvalid, ParserError)
+        # are ValueErrors
+        return pd.read_csv(path)
+    if any(pd.api.types.is_datetime64_any_dtype(dtype) for dtype in df.dtypes):
+        return pd.read_csv(path)
+    return df
+
+
+def _freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Make a DataFrame's column data read-only, in place.
+
+    The responses frame is shared by reference between pipelines, the
+    agent and the executor; an accidental in-place write then raises
+    instead of silently changing every later result.
+    """
+    for column in df.columns:
+        values = df[column].to_numpy()
+        # Column arrays are views into pandas' 2-D blocks; lock the block
+        while isinstance(values.base, np.ndarray):
+            values = values.base
+        values.setflags(write=False)
+    return df
+
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    """Write a Parquet copy of the responses, replacing any old copy atomically."""
+    tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    try:
+        df.to_parquet(tmp_path, index=False, compression="zstd", row_group_size=64_000)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        # pyarrow missing or columns Parquet can't represent; keep using the CSV
+        tmp_path.unlink(missing_ok=True)
+        logger.debug(f"Skipping Parquet copy of responses: {e}")
+
+
+def _read_responses(path: Path) -> pd.DataFrame:
+    """Read responses.csv, via its Parquet copy when DD_PARQUET_CACHE is set.
+
+    A ``responses.parquet`` next to the CSV is used while it is newer than
+    the CSV; otherwise the CSV is parsed and the copy rewritten in the
+    background.
+    """
+    if not settings.DD_PARQUET_CACHE:
+        return _read_responses_csv(path)
+
+    parquet_path = path.with_suffix(".parquet")
+    try:
+        if parquet_path.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            return pd.read_parquet(parquet_path)
+    except (OSError, ImportError, ValueError):
+        # No (readable) copy yet
+        pass
+
+    df = _read_responses_csv(path)
+    Thread(target=_write_parquet, args=(df, parquet_path), name="responses-parquet").start()
+    return df
+
+
+def _write_csv(df: pd.DataFrame, path: Path) -> None:
+    """Write a DataFrame as CSV, using pyarrow's C++ writer when possible."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (ImportError, ValueError, TypeError):
+        # pyarrow missing, or columns Arrow can't represent (e.g. nested records);
+        # a 1 MiB buffer coalesces pandas' many small writes
+        with open(path, "w", buffering=_CSV_BUFFER_SIZE, newline="") as f:
+            df.to_csv(f, index=False, lineterminator="\n", chunksize=50_000)
+        return
+    pacsv.write_csv(table, str(path))
+
+
+def _write_table(df: pd.DataFrame, directory: Path, name: str) -> None:
+    """Write a result table in the DD_TABLE_FORMAT format.
+
+    Parquet (zstd) falls back to CSV when pyarrow is not installed or the
+    table can't be stored as Parquet.
+    """
+    if settings.DD_TABLE_FORMAT == "parquet":
+        parquet_path = directory / f"{name}.parquet"
+        try:
+            df.to_parquet(
+                parquet_path,
+                index=False,
+                compression="zstd",
+                compression_level=3,
+                row_group_size=32_768,
+            )
+            return
+        except (ImportError, ValueError, TypeError):
+            parquet_path.unlink(missing_ok=True)
+    _write_csv(df, directory / f"{name}.csv")
+
 
 @dataclass
 class PipelineResult:
@@ -79,706 +278,294 @@ class Pipeline:
         self.data_dir = Path(data_dir)
         self.runs_dir = runs_dir or self.data_dir / "runs"
 
-        # Load data
+        # Load data (responses and scope are read on first use)
+        self.scope_path = self.data_dir / "scope.md"
+        self._scope_exists = self.scope_path.is_file()
         self.questions = self._load_questions()
-        self.responses_df = self._load_responses()
-        self.scope = self._load_scope()
 
-        # Create agent
-        self.agent = Agent(
+        # Planned cuts are reused for repeated prompts on the same data
+        self.plan_cache: PlanCache[_CachedCutPlan] = PlanCache(
+            Path(self.runs_dir) / ".plan_cache", _CachedCutPlan
+        )
+        self.template_cache: PlanCache[HighLevelPlan] = PlanCache(
+            Path(self.runs_dir) / ".plan_templates", HighLevelPlan
+        )
+
+    @cached_property
+    def responses_df(self) -> pd.DataFrame:
+        """Survey responses, loaded when an analysis first needs them."""
+        return self._load_responses()
+
+    @cached_property
+    def scope(self) -> Optional[str]:
+        """Project scope from scope.md, read when first needed."""
+        return self._load_scope()
+
+    @cached_property
+    def agent(self) -> "Agent":
+        """Agent over the loaded data, created on first use.
+
+        The import is deferred too: the agent pulls in the tools and the
+        OpenAI client, which loading data alone doesn't need.
+        """
+        from dd_agent.orchestrator.agent import Agent
+
+        return Agent(
             questions=self.questions,
             responses_df=self.responses_df,
             scope=self.scope,
             data_dir=self.data_dir,
         )
 
-    def _load_questions(self) -> list[Question]:
-        """Load questions from questions.json."""
-        questions_path = self.data_dir / "questions.json"
-        if not questions_path.exists():
-            raise FileNotFoundError(f"Questions file not found: {questions_path}")
+    @cached_property
+    def dataset_hash(self) -> str:
+        """SHA-256 of the input files, reused across runs while they are unchanged."""
+        return hash_dataset_cached(
+            Path(self.runs_dir) / ".hash_cache.json",
+            self.data_dir / "questions.json",
+            self.data_dir / "responses.csv",
+            self.scope_path if self._scope_exists else None,
+        )
 
-        with open(questions_path) as f:
-            data = json.load(f)
+    def _cached_cut_plan(self, prompt: str) -> tuple[str, Optional[ToolOutput]]:
+        """Look up a cached plan for a prompt on this dataset's contents.
 
-        # Handle both list and dict formats
-        if isinstance(data, list):
-            return [Question.model_validate(q) for q in data]
-        elif isinstance(data, dict) and "questions" in data:
-            return [Question.model_validate(q) for q in data["questions"]]
-        else:
-            raise ValueError("Invalid questions.json format")
+        Returns:
+            (fingerprint, cached ToolOutput or None)
+        """
+        fingerprint = plan_fingerprint(prompt, self.dataset_hash)
+        entry = self.plan_cache.get(fingerprint)
+        if entry is None:
+            return fingerprint, None
+        logger.info(f"Using cached plan for: {prompt}")
+        return fingerprint, ToolOutput.success(
+            data=entry.cut, warnings=entry.warnings, trace={"plan_cache": "hit"}
+        )
 
-    def _load_responses(self) -> pd.DataFrame:
-        """Load responses from responses.csv."""
-        responses_path = self.data_dir / "responses.csv"
-        if not responses_path.exists():
-            raise FileNotFoundError(f"Responses file not found: {responses_path}")
+    def _store_cut_plan(self, fingerprint: str, cut_result: ToolOutput) -> None:
+        """Store a successfully planned cut and its warnings in the plan cache."""
+        if cut_result.ok and cut_result.data is not None:
+            self.plan_cache.put(
+                fingerprint,
+                _CachedCutPlan(cut=cut_result.data, warnings=cut_result.warnings),
+            )
 
-        return pd.read_csv(responses_path)
+    def _plan_cut(self, prompt: str) -> ToolOutput:
+        """Plan a cut, reusing a cached plan for the same prompt and data.
 
-    def _load_scope(self) -> Optional[str]:
-        """Load scope from scope.md if it exists."""
-        scope_path = self.data_dir / "scope.md"
-        if scope_path.exists():
-            return scope_path.read_text()
-        return None
+        The plan cache is opt-in via the DD_PLAN_CACHE setting.
+        """
+        if not settings.DD_PLAN_CACHE:
+            return self.agent.plan_cut(prompt)
 
-    def run_single(
-        self,
-        prompt: str,
-        save_run: bool = True,
-    ) -> PipelineResult:
-        """Execute a single analysis request.
+        fingerprint, cached = self._cached_cut_plan(prompt)
+        if cached is not None:
+            return cached
 
-        Args:
-            prompt: Natural language analysis request
-            save_run: Whether to save run artifacts
+        cut_result = self.agent.plan_cut(prompt)
+        self._store_cut_plan(fingerprint, cut_result)
+        return cut_result
 
-        Returns:
-            PipelineResult with execution details
-        """
-        # 1. Initialize RunStore
-        run_store = RunStore(self.runs_dir)
-        run_id = run_store.new_run(prompt)
-        run_dir = run_store.run_dir
-        
-        logger.info(f"Starting run {run_id} with prompt: {prompt}")
+    def _plan_cuts(self, prompts: list[str]) -> list[ToolOutput]:
+        """Plan several cuts, sending only plan cache misses to one batched call."""
+        if not settings.DD_PLAN_CACHE:
+            return self.agent.plan_cuts(prompts)
 
-        try:
-            # 2. Save input files
-            run_store.save_input("questions.json", self.data_dir / "questions.json")
-            run_store.save_input("responses.csv", self.data_dir / "responses.csv")
-            if self.scope:
-                run_store.save_input_text("scope.md", self.scope)
-            
-            # 3. Compute dataset hash
-            run_store.compute_dataset_hash(
-                self.data_dir / "questions.json",
-                self.data_dir / "responses.csv",
-                self.data_dir / "scope.md" if (self.data_dir / "scope.md").exists() else None
-            )
-            
-            # 4. Plan the cut via agent
-            logger.info(f"Planning cut for: {prompt}")
-            cut_result = self.agent.plan_cut(prompt)
-            
-            if not cut_result.ok:
-                errors = []
-                for error in cut_result.errors:
-                    if isinstance(error, ToolMessage):
-                        errors.append(error.message)
-                    else:
-                        errors.append(str(error))
-                
-                logger.error(f"Cut planning failed: {errors}")
-                
-                # Save failure result
-                if save_run:
-                    run_store.save_artifact("cut_planning_error.json", {
-                        "prompt": prompt,
-                        "errors": errors,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    run_store.save_report(PipelineResult(
-                        success=False,
-                        run_id=run_id,
-                        run_dir=run_dir,
-                        errors=errors
-                    ))
-                
-                return PipelineResult(
-                    success=False,
-                    run_id=run_id,
-                    run_dir=run_dir,
-                    errors=errors
-                )
-            
-            cut_spec = cut_result.data
-            logger.info(f"Cut planned successfully: {cut_spec.cut_id}")
+        lookups = [self._cached_cut_plan(prompt) for prompt in prompts]
+        fingerprints = [fingerprint for fingerprint, _ in lookups]
+        results = [cached for _, cached in lookups]
 
-            # 5. Execute the cut
-            logger.info(f"Executing cut: {cut_spec.cut_id}")
-            execution_result = self.agent.execute_single_cut(cut_spec)
-            
-            # 6. Save artifacts and generate report
-            if save_run:
-                # Save cut specification
-                run_store.save_artifact("cut_spec.json", cut_spec)
-                
-                # Save execution results
-                run_store.save_artifact("execution_result.json", execution_result)
-                
-                # Save individual tables as separate files
-                for i, table in enumerate(execution_result.tables):
-                    table_filename = f"table_{i}_{cut_spec.cut_id}.json"
-                    run_store.save_artifact(table_filename, table)
-                    
-                    # Also save as CSV if dataframe exists
-                    if hasattr(table, 'df') and table.df is not None:
-                        csv_filename = f"table_{i}_{cut_spec.cut_id}.csv"
-                        csv_path = run_dir / "artifacts" / csv_filename
-                        table.df.to_csv(csv_path, index=False)
-                
-                # Generate report
-                pipeline_result = PipelineResult(
-                    success=True,
-                    run_id=run_id,
-                    run_dir=run_dir,
-                    cuts_planned=[cut_spec],
-                    execution_result=execution_result
-                )
-                run_store.save_report(pipeline_result)
-                
-                logger.info(f"Artifacts saved to: {run_dir}")
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            planned = self.agent.plan_cuts([prompts[i] for i in misses])
+            for i, cut_result in zip(misses, planned):
+                self._store_cut_plan(fingerprints[i], cut_result)
+                results[i] = cut_result
+        return results
 
-            return PipelineResult(
-                success=True,
-                run_id=run_id,
-                run_dir=run_dir,
-                cuts_planned=[cut_spec],
-                execution_result=execution_result
-            )
-            
-        except Exception as e:
-            logger.error(f"Pipeline execution failed: {str(e)}")
-            
-            # Save error to artifacts
-            if save_run and 'run_store' in locals():
-                run_store.save_artifact("pipeline_error.json", {
-                    "error": str(e),
-                    "timestamp": datetime.now().isoformat()
-                })
-            
-            return PipelineResult(
-                success=False,
-                run_id=run_id,
-                run_dir=run_dir,
-                errors=[str(e)]
-            )
+    async def plan_cuts_async(self, prompts: list[str]) -> list[ToolOutput]:
+        """Plan several prompts concurrently.
 
-    def run_autoplan(
-        self,
-        save_run: bool = True,
-        max_cuts: int = 20,
-    ) -> PipelineResult:
-        """Generate and execute a full analysis plan.
+        At most ``settings.DD_CUT_CONCURRENCY`` LLM calls are in flight at
+        once. A prompt whose planning raises gets a failed ToolOutput.
 
         Args:
-            save_run: Whether to save run artifacts
-            max_cuts: Maximum number of cuts to execute
+            prompts: Natural language analysis requests
 
         Returns:
-            PipelineResult with execution details
+            One ToolOutput per prompt, in the same order
         """
-        # 1. Initialize RunStore
-        run_store = RunStore(self.runs_dir)
-        run_id = run_store.new_run("Auto-plan: Comprehensive analysis")
-        run_dir = run_store.run_dir
-        
-        logger.info(f"Starting autoplan run {run_id}")
+        semaphore = asyncio.Semaphore(settings.DD_CUT_CONCURRENCY)
 
-        try:
-            # 2. Save input files
-            run_store.save_input("questions.json", self.data_dir / "questions.json")
-            run_store.save_input("responses.csv", self.data_dir / "responses.csv")
-            if self.scope:
-                run_store.save_input_text("scope.md", self.scope)
-            
-            # 3. Compute dataset hash
-            run_store.compute_dataset_hash(
-                self.data_dir / "questions.json",
-                self.data_dir / "responses.csv",
-                self.data_dir / "scope.md" if (self.data_dir / "scope.md").exists() else None
-            )
-            
-            # 4. Generate high-level plan via agent
-            logger.info("Generating high-level analysis plan")
-            plan_result = self.agent.plan_analysis()
-            
-            if not plan_result.ok:
-                errors = []
-                for error in plan_result.errors:
-                    if isinstance(error, ToolMessage):
-                        errors.append(error.message)
-                    else:
-                        errors.append(str(error))
-                
-                logger.error(f"High-level planning failed: {errors}")
-                
-                if save_run:
-                    run_store.save_artifact("planning_error.json", {
-                        "errors": errors,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    run_store.save_report(PipelineResult(
-                        success=False,
-                        run_id=run_id,
-                        run_dir=run_dir,
-                        errors=errors
-                    ))
-                
-                return PipelineResult(
-                    success=False,
-                    run_id=run_id,
-                    run_dir=run_dir,
-                    errors=errors
-                )
-            
-            high_level_plan = plan_result.data
-            logger.info(f"High-level plan generated with {len(high_level_plan.intents)} intents")
-            
-            # 5. Add suggested segments to agent
-            if hasattr(high_level_plan, 'suggested_segments') and high_level_plan.suggested_segments:
-                for segment in high_level_plan.suggested_segments:
-                    self.agent.add_segment(segment)
-                    logger.info(f"Added suggested segment: {segment.name}")
-            
-            # 6. Plan and execute cuts for each intent
-            all_cuts_planned = []
-            all_cuts_failed = []
-            all_execution_results = []
-            
-            # Sort intents by priority
-            sorted_intents = sorted(
-                high_level_plan.intents,
-                key=lambda x: {"high": 0, "medium": 1, "low": 2}.get(x.priority, 3)
-            )
-            
-            # Limit to max_cuts
-            intents_to_process = sorted_intents[:max_cuts]
-            
-            for i, intent in enumerate(intents_to_process):
-                logger.info(f"Processing intent {i+1}/{len(intents_to_process)}: {intent.description}")
-                
-                try:
-                    # Plan cut from intent description
-                    cut_result = self.agent.plan_cut(intent.description)
-                    
-                    if cut_result.ok:
-                        cut_spec = cut_result.data
-                        all_cuts_planned.append(cut_spec)
-                        
-                        # Execute the cut
-                        exec_result = self.agent.execute_single_cut(cut_spec)
-                        all_execution_results.append(exec_result)
-                        
-                        logger.info(f"✓ Executed cut: {cut_spec.cut_id}")
-                    else:
-                        # Extract error messages from ToolMessages
-                        error_messages = []
-                        for error in cut_result.errors:
-                            if isinstance(error, ToolMessage):
-                                error_messages.append(error.message)
-                            else:
-                                error_messages.append(str(error))
-                        
-                        failed_cut = {
-                            "intent_id": getattr(intent, 'intent_id', f"intent_{i}"),
-                            "description": intent.description,
-                            "errors": error_messages
-                        }
-                        all_cuts_failed.append(failed_cut)
-                        logger.warning(f"✗ Failed to plan cut for intent: {intent.description}")
-                        
-                except Exception as e:
-                    failed_cut = {
-                        "intent_id": getattr(intent, 'intent_id', f"intent_{i}"),
-                        "description": intent.description,
-                        "error": str(e)
-                    }
-                    all_cuts_failed.append(failed_cut)
-                    logger.error(f"Error processing intent: {e}")
-            
-            # 7. Combine all execution results
-            combined_tables = []
-            combined_errors = []
-            segments_computed = {}
-            
-            for result in all_execution_results:
-                combined_tables.extend(result.tables)
-                combined_errors.extend(result.errors)
-                if result.segments_computed:
-                    segments_computed.update(result.segments_computed)
-            
-            combined_execution_result = ExecutionResult(
-                tables=combined_tables,
-                errors=combined_errors,
-                segments_computed=segments_computed
-            )
-            
-            # 8. Save artifacts and generate report
-            if save_run:
-                # Save high-level plan
-                run_store.save_artifact("high_level_plan.json", high_level_plan)
-                
-                # Save all cut specifications
-                run_store.save_artifact("all_cuts.json", all_cuts_planned)
-                
-                # Save failed cuts
-                if all_cuts_failed:
-                    run_store.save_artifact("failed_cuts.json", all_cuts_failed)
-                
-                # Save execution summary
-                run_store.save_artifact("execution_summary.json", {
-                    "total_intents": len(high_level_plan.intents),
-                    "intents_processed": len(intents_to_process),
-                    "cuts_planned": len(all_cuts_planned),
-                    "cuts_failed": len(all_cuts_failed),
-                    "tables_generated": len(combined_execution_result.tables),
-                    "errors_encountered": len(combined_execution_result.errors)
-                })
-                
-                # Save each table
-                for i, table in enumerate(combined_execution_result.tables):
-                    table_filename = f"table_{i}_{table.cut_id}.json"
-                    run_store.save_artifact(table_filename, table)
-                    
-                    # Also save as CSV
-                    if hasattr(table, 'df') and table.df is not None:
-                        csv_filename = f"table_{i}_{table.cut_id}.csv"
-                        csv_path = run_dir / "artifacts" / csv_filename
-                        table.df.to_csv(csv_path, index=False)
-                
-                # Generate comprehensive report
-                pipeline_result = PipelineResult(
-                    success=len(all_cuts_planned) > 0,
-                    run_id=run_id,
-                    run_dir=run_dir,
-                    plan=high_level_plan,
-                    cuts_planned=all_cuts_planned,
-                    cuts_failed=all_cuts_failed,
-                    execution_result=combined_execution_result,
-                    errors=[] if len(all_cuts_planned) > 0 else ["No cuts were successfully executed"]
-                )
-                run_store.save_report(pipeline_result)
-                
-                logger.info(f"Autoplan complete. Artifacts saved to: {run_dir}")
-            
-            return PipelineResult(
-                success=len(all_cuts_planned) > 0,
-                run_id=run_id,
-                run_dir=run_dir,
-                plan=high_level_plan,
-                cuts_planned=all_cuts_planned,
-                cuts_failed=all_cuts_failed,
-                execution_result=combined_execution_result,
-                errors=[] if len(all_cuts_planned) > 0 else ["No cuts were successfully executed"]
-            )
-            
-        except Exception as e:
-            logger.error(f"Autoplan pipeline failed: {str(e)}")
-            
-            if save_run and 'run_store' in locals():
-                run_store.save_artifact("autoplan_error.json", {
-                    "error": str(e),
-                    "timestamp": datetime.now().isoformat()
-                })
-            
-            return PipelineResult(
-                success=False,
-                run_id=run_id,
-                run_dir=run_dir,
-                errors=[str(e)]
+        async def plan(prompt: str) -> ToolOutput:
+            async with semaphore:
+                return await asyncio.to_thread(self._plan_cut, prompt)
+
+        results = await asyncio.gather(
+            *(plan(prompt) for prompt in prompts), return_exceptions=True
+        )
+        return [
+            result
+            if isinstance(result, ToolOutput)
+            else ToolOutput.failure(
+                errors=[ToolMessage(code="planning_error", message=str(result))]
             )
-    
-    def run_interactive(
-        self,
-        prompt: Optional[str] = None,
-        save_run: bool = True,
-    ) -> PipelineResult:
-        """Execute an analysis request with interactive ambiguity resolution.
-        
-        Args:
-            prompt: Optional starting prompt (if None, will prompt user)
-            save_run: Whether to save run artifacts
-            
+            for result in results
+        ]
+
+    def _schema_fingerprint(self) -> str:
+        """Fingerprint the dataset schema (columns, question ids, scope)."""
+        sha256 = hashlib.sha256()
+        for column in sorted(map(str, self.responses_df.columns)):
+            sha256.update(f"col:{column}\n".encode("utf-8"))
+        for question_id in sorted(q.question_id for q in self.questions):
+            sha256.update(f"q:{question_id}\n".encode("utf-8"))
+        sha256.update(f"scope:{self.scope or ''}".encode("utf-8"))
+        return sha256.hexdigest()
+
+    def _plan_analysis(self) -> ToolOutput:
+        """Generate the high-level plan, reusing a cached one for the same schema.
+
+        The template cache is opt-in via the DD_TEMPLATE_CACHE setting.
+        """
+        if not settings.DD_TEMPLATE_CACHE:
+            return self.agent.plan_analysis()
+
+        fingerprint = self._schema_fingerprint()
+        cached = self.template_cache.get(fingerprint)
+        if cached is not None:
+            logger.info("Using cached high-level plan")
+            return ToolOutput.success(data=cached, trace={"template_cache": "hit"})
+
+        plan_result = self.agent.plan_analysis()
+        if plan_result.ok and plan_result.data is not None:
+            self.template_cache.put(fingerprint, plan_result.data)
+        return plan_result
+
+    def _new_run(self, prompt: str) -> tuple[RunStore, str, Path]:
+        """Create a run directory for a flow.
+
         Returns:
-            PipelineResult with execution details
+            (run_store, run_id, run_dir)
         """
-        # 1. Get prompt from user if not provided
-        if not prompt:
-            console = Console()
-            prompt = console.input("\n🔍 [bold]Enter analysis request: [/bold]")
-            if not prompt.strip():
-                return PipelineResult(
-                    success=False,
-                    run_id="",
-                    run_dir=Path("."),
-                    errors=["No prompt provided"]
-                )
-        
-        # 2. Initialize RunStore
         run_store = RunStore(self.runs_dir)
         run_id = run_store.new_run(prompt)
-        run_dir = run_store.run_dir
-        
-        logger.info(f"Starting interactive run {run_id} with prompt: {prompt}")
-        
-        try:
-            # 3. Plan the cut (may require user interaction)
-            logger.info(f"Planning cut for: {prompt}")
-            cut_result = self.agent.plan_cut(prompt)
-            
-            # 4. Handle ambiguity resolution
-            resolution_attempts = 0
-            max_resolution_attempts = 3
-            
-            while hasattr(cut_result, 'requires_user_input') and cut_result.requires_user_input and resolution_attempts < max_resolution_attempts:
-                resolution_attempts += 1
-                
-                console.print("\n" + "="*60)
-                console.print("[bold yellow]🤔 AMBIGUITY DETECTED[/bold yellow]")
-                console.print("="*60)
-                console.print(f"Your request '[cyan]{prompt}[/cyan]' could mean multiple things:")
-                console.print()
-                
-                # Display options
-                for i, option in enumerate(cut_result.user_input_options):
-                    question_id = option.get("question_id", "UNKNOWN")
-                    label = option.get("label", "No label")
-                    match_reason = option.get("match_reason", "No reason given")
-                    confidence = option.get("confidence", 0.0)
-                    
-                    console.print(f"[bold]{i+1}.[/bold] {label}")
-                    console.print(f"   [dim]Question ID: {question_id}[/dim]")
-                    console.print(f"   [dim]Match reason: {match_reason}[/dim]")
-                    console.print(f"   [dim]Confidence: {confidence:.1%}[/dim]")
-                    console.print()
-                
-                console.print(f"[bold]{len(cut_result.user_input_options)+1}.[/bold] Enter a different request")
-                console.print(f"[bold]{len(cut_result.user_input_options)+2}.[/bold] Cancel analysis")
-                console.print()
-                
-                # Get user choice
-                try:
-                    choice = console.input(f"Select option (1-{len(cut_result.user_input_options)+2}): ").strip()
-                    choice_num = int(choice)
-                    
-                    if choice_num == len(cut_result.user_input_options) + 1:
-                        # New request
-                        prompt = console.input("Enter new analysis request: ")
-                        if not prompt.strip():
-                            return PipelineResult(
-                                success=False,
-                                run_id=run_id,
-                                run_dir=run_dir,
-                                errors=["No new prompt provided"]
-                            )
-                        cut_result = self.agent.plan_cut(prompt)
-                        
-                    elif choice_num == len(cut_result.user_input_options) + 2:
-                        # Cancel
-                        return PipelineResult(
-                            success=False,
-                            run_id=run_id,
-                            run_dir=run_dir,
-                            errors=["Analysis cancelled by user"]
-                        )
-                        
-                    elif 1 <= choice_num <= len(cut_result.user_input_options):
-                        # User selected an option
-                        selected_index = choice_num - 1
-                        logger.info(f"User selected option {choice_num}: {cut_result.user_input_options[selected_index].get('question_id')}")
-                        
-                        # Resolve with selected option
-                        # First, we need to ensure agent has resolve_ambiguity_and_plan method
-                        if hasattr(self.agent, 'resolve_ambiguity_and_plan'):
-                            cut_result = self.agent.resolve_ambiguity_and_plan(prompt, selected_index)
-                        else:
-                            # Fallback: create modified prompt with selection
-                            selected_question_id = cut_result.user_input_options[selected_index].get('question_id')
-                            modified_prompt = f"{prompt} (use question: {selected_question_id})"
-                            cut_result = self.agent.plan_cut(modified_prompt)
-                        
-                    else:
-                        console.print(f"[red]Invalid choice. Please enter 1-{len(cut_result.user_input_options)+2}[/red]")
-                        continue
-                        
-                except ValueError:
-                    console.print("[red]Please enter a number[/red]")
-                    continue
-                
-                except Exception as e:
-                    logger.error(f"Error during user interaction: {e}")
-                    return PipelineResult(
-                        success=False,
-                        run_id=run_id,
-                        run_dir=run_dir,
-                        errors=[f"Interaction error: {str(e)}"]
-                    )
-            
-            # 5. Check if we still have ambiguity after attempts
-            if hasattr(cut_result, 'requires_user_input') and cut_result.requires_user_input:
-                console.print("\n[bold yellow]⚠️  Too many resolution attempts. Using highest confidence option.[/bold yellow]")
-                # Use first (highest confidence) option
-                if hasattr(self.agent, 'resolve_ambiguity_and_plan'):
-                    cut_result = self.agent.resolve_ambiguity_and_plan(prompt, 0)
-                else:
-                    selected_question_id = cut_result.user_input_options[0].get('question_id')
-                    modified_prompt = f"{prompt} (use question: {selected_question_id})"
-                    cut_result = self.agent.plan_cut(modified_prompt)
-            
-            # 6. Process the final cut result
-            if not cut_result.ok:
-                errors = []
-                for error in cut_result.errors:
-                    if isinstance(error, ToolMessage):
-                        errors.append(error.message)
-                    else:
-                        errors.append(str(error))
-                
-                logger.error(f"Cut planning failed: {errors}")
-                
-                if save_run:
-                    run_store.save_artifact("cut_planning_error.json", {
-                        "prompt": prompt,
-                        "errors": errors,
-                        "interactive": True,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                
-                return PipelineResult(
-                    success=False,
-                    run_id=run_id,
-                    run_dir=run_dir,
-                    errors=errors
-                )
-            
-            cut_spec = cut_result.data
-            logger.info(f"Cut planned successfully: {cut_spec.cut_id}")
+        return run_store, run_id, run_store.run_dir
 
-            # 7. Execute the cut
-            logger.info(f"Executing cut: {cut_spec.cut_id}")
-            execution_result = self.agent.execute_single_cut(cut_spec)
-            
-            # 8. Save artifacts and generate report
-            if save_run:
-                # Save input files
-                run_store.save_input("questions.json", self.data_dir / "questions.json")
-                run_store.save_input("responses.csv", self.data_dir / "responses.csv")
-                if self.scope:
-                    run_store.save_input_text("scope.md", self.scope)
-                
-                # Compute dataset hash
-                run_store.compute_dataset_hash(
-                    self.data_dir / "questions.json",
-                    self.data_dir / "responses.csv",
-                    self.data_dir / "scope.md" if (self.data_dir / "scope.md").exists() else None
-                )
-                
-                # Save cut specification
-                run_store.save_artifact("cut_spec.json", cut_spec)
-                
-                # Save execution results
-                run_store.save_artifact("execution_result.json", execution_result)
-                
-                # Save interaction trace
-                if hasattr(cut_result, 'trace') and cut_result.trace:
-                    run_store.save_artifact("interaction_trace.json", {
-                        "original_prompt": prompt,
-                        "resolution_attempts": resolution_attempts,
-                        "final_cut_id": cut_spec.cut_id,
-                        "trace": cut_result.trace
-                    })
-                
-                # Save individual tables
-                for i, table in enumerate(execution_result.tables):
-                    table_filename = f"table_{i}_{cut_spec.cut_id}.json"
-                    run_store.save_artifact(table_filename, table)
-                    
-                    if hasattr(table, 'df') and table.df is not None:
-                        csv_filename = f"table_{i}_{cut_spec.cut_id}.csv"
-                        csv_path = run_dir / "artifacts" / csv_filename
-                        table.df.to_csv(csv_path, index=False)
-                
-                # Generate report
-                pipeline_result = PipelineResult(
-                    success=True,
-                    run_id=run_id,
-                    run_dir=run_dir,
-                    cuts_planned=[cut_spec],
-                    execution_result=execution_result
-                )
-                run_store.save_report(pipeline_result)
-                
-                logger.info(f"Artifacts saved to: {run_dir}")
+    def _snapshot_inputs(self, run_store: RunStore) -> None:
+        """Queue copies of the input files into the run and record their hash.
 
-            return PipelineResult(
-                success=True,
-                run_id=run_id,
-                run_dir=run_dir,
-                cuts_planned=[cut_spec],
-                execution_result=execution_result
-            )
-            
-        except Exception as e:
-            logger.error(f"Interactive pipeline execution failed: {str(e)}")
-            
-            if save_run and 'run_store' in locals():
-                run_store.save_artifact("interactive_error.json", {
-                    "error": str(e),
-                    "timestamp": datetime.now().isoformat()
-                })
-            
-            return PipelineResult(
-                success=False,
-                run_id=run_id,
-                run_dir=run_dir,
-                errors=[str(e)]
-            )
-# 创建全局console对象
-console = Console()
+        The copies run on the store's background writer; flush the store
+        before relying on them.
+        """
+        run_store.submit(run_store.save_input_cached, "questions.json", self.data_dir / "questions.json")
+        run_store.submit(run_store.save_input_cached, "responses.csv", self.data_dir / "responses.csv")
+        if self.scope:
+            run_store.submit(run_store.save_input_text, "scope.md", self.scope)
+
+        run_store.compute_dataset_hash(
+            self.data_dir / "questions.json",
+            self.data_dir / "responses.csv",
+            self.scope_path if self._scope_exists else None,
+            digest=self.dataset_hash,
+        )
 
+    def _plan_and_execute_intent(
+        self, i: int, intent: Any, total: int, cut_result: Optional[ToolOutput] = None
+    ) -> tuple[Optional[CutSpec], Any]:
+        """Plan and execute one autoplan intent (runs on a worker thread).
 
-@dataclass
-class PipelineResult:
-    """Result of a pipeline execution."""
+        Args:
+            i: Index of the intent in processing order
+            intent: The AnalysisIntent to plan
+            total: Number of intents being processed
+            cut_result: The intent's plan, if already planned in a batch
 
-    success: bool
-    run_id: str
-    run_dir: Path
-    plan: Optional[HighLevelPlan] = None
-    cuts_planned: list[CutSpec] = field(default_factory=list)
-    cuts_failed: list[dict[str, Any]] = field(default_factory=list)
-    execution_result: Optional[ExecutionResult] = None
-    errors: list[str] = field(default_factory=list)
+        Returns:
+            (cut_spec, execution_result) on success, or (None, failure_dict)
+        """
+        logger.info(f"Processing intent {i+1}/{total}: {intent.description}")
 
+        try:
+            # Plan cut from intent description
+            if cut_result is None:
+                cut_result = self._plan_cut(intent.description)
 
-class Pipeline:
-    """Pipeline for running analysis flows.
+            if cut_result.ok:
+                cut_spec = cut_result.data
 
-    Provides two main flows:
-    1. run_single: Execute a single analysis request
-    2. run_autoplan: Generate and execute a full analysis plan
-    """
+                # Execute the cut
+                exec_result = self.agent.execute_single_cut(cut_spec)
 
-    def __init__(
+                logger.info(f"✓ Executed cut: {cut_spec.cut_id}")
+                return cut_spec, exec_result
+            else:
+                logger.warning(f"✗ Failed to plan cut for intent: {intent.description}")
+                return None, {
+                    "intent_id": getattr(intent, 'intent_id', f"intent_{i}"),
+                    "description": intent.description,
+                    "errors": _extract_errors(cut_result.errors)
+                }
+
+        except Exception as e:
+            logger.error(f"Error processing intent: {e}")
+            return None, {
+                "intent_id": getattr(intent, 'intent_id', f"intent_{i}"),
+                "description": intent.description,
+                "error": str(e)
+            }
+
+    def _submit_table_writes(
         self,
-        data_dir: Path,
-        runs_dir: Optional[Path] = None,
-    ):
-        """Initialize the pipeline.
+        pool: ThreadPoolExecutor,
+        run_store: RunStore,
+        tables: list[Any],
+        cut_id: Optional[str] = None,
+        start: int = 0,
+    ) -> list[Future]:
+        """Queue a JSON (and CSV/Parquet when it has a DataFrame) write per table.
 
         Args:
-            data_dir: Directory containing questions.json, responses.csv, scope.md
-            runs_dir: Directory for saving run artifacts (defaults to data_dir/runs)
+            pool: Thread pool to run the writes on
+            run_store: Store for the active run
+            tables: TableResults to save, in order
+            cut_id: Cut ID used in file names (defaults to each table's own)
+            start: Index of the first table in file names
+
+        Returns:
+            One future per table
         """
-        self.data_dir = Path(data_dir)
-        self.runs_dir = runs_dir or self.data_dir / "runs"
+        def save_one(i: int, table: Any) -> None:
+            name = f"table_{i}_{cut_id or table.cut_id}"
+            run_store.save_artifact(f"{name}.json", table)
 
-        # Load data
-        self.questions = self._load_questions()
-        self.responses_df = self._load_responses()
-        self.scope = self._load_scope()
+            # Also save the table data if a dataframe exists
+            df = table.get_dataframe()
+            if df is not None:
+                _write_table(df, run_store.artifacts_dir, name)
 
-        # Create agent
-        self.agent = Agent(
-            questions=self.questions,
-            responses_df=self.responses_df,
-            scope=self.scope,
-            data_dir=self.data_dir,
-        )
+        return [pool.submit(save_one, start + i, table) for i, table in enumerate(tables)]
+
+    def _save_tables(
+        self,
+        run_store: RunStore,
+        tables: list[Any],
+        cut_id: Optional[str] = None,
+    ) -> None:
+        """Save each table as JSON (and CSV/Parquet when it has a DataFrame).
+
+        Tables are independent files, so the writes run on a thread pool.
+
+        Args:
+            run_store: Store for the active run
+            tables: TableResults to save, in order
+            cut_id: Cut ID used in file names (defaults to each table's own)
+        """
+        if not tables:
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(tables))) as pool:
+            for future in self._submit_table_writes(pool, run_store, tables, cut_id):
+                future.result()
 
     def _load_questions(self) -> list[Question]:
         """Load questions from questions.json."""
@@ -786,16 +573,23 @@ class Pipeline:
         if not questions_path.exists():
             raise FileNotFoundError(f"Questions file not found: {questions_path}")
 
-        with open(questions_path) as f:
-            data = json.load(f)
+        return _load_cached(questions_path, self._parse_questions)
 
-        # Handle both list and dict formats
-        if isinstance(data, list):
-            return [Question.model_validate(q) for q in data]
-        elif isinstance(data, dict) and "questions" in data:
-            return [Question.model_validate(q) for q in data["questions"]]
-        else:
-            raise ValueError("Invalid questions.json format")
+    @staticmethod
+    def _parse_questions(questions_path: Path) -> list[Question]:
+        """Parse question definitions from a questions.json file."""
+        raw = questions_path.read_bytes()
+
+        # Handle both list and dict formats, each parsed and validated in
+        # one pydantic-core pass
+        start = raw.lstrip()[:1]
+        if start == b"[":
+            return _QUESTIONS_ADAPTER.validate_json(raw)
+        if start == b"{":
+            data = _QUESTIONS_FILE_ADAPTER.validate_json(raw)
+            if "questions" in data:
+                return data["questions"]
+        raise ValueError("Invalid questions.json format")
 
     def _load_responses(self) -> pd.DataFrame:
         """Load responses from responses.csv."""
@@ -803,13 +597,16 @@ class Pipeline:
         if not responses_path.exists():
             raise FileNotFoundError(f"Responses file not found: {responses_path}")
 
-        return pd.read_csv(responses_path)
+        # Shared between pipelines by reference; the agent and executor
+        # only read it, which _freeze_frame enforces
+        return _load_cached(
+            responses_path, lambda path: _freeze_frame(_read_responses(path))
+        )
 
     def _load_scope(self) -> Optional[str]:
         """Load scope from scope.md if it exists."""
-        scope_path = self.data_dir / "scope.md"
-        if scope_path.exists():
-            return scope_path.read_text()
+        if self._scope_exists:
+            return _load_cached(self.scope_path, Path.read_text)
         return None
 
     def run_single(
@@ -827,40 +624,30 @@ class Pipeline:
             PipelineResult with execution details
         """
         # 1. Initialize RunStore
-        run_store = RunStore(self.runs_dir)
-        run_id = run_store.new_run(prompt)  # FIXED: new_run() not create_run()
-        run_dir = run_store.run_dir  # FIXED: Use run_store.run_dir
+        run_store, run_id, run_dir = self._new_run(prompt)
+        run_started_at = run_store.started_at.isoformat()
         
         logger.info(f"Starting run {run_id} with prompt: {prompt}")
 
         try:
-            # 2. Save input files
-            run_store.save_input("questions.json", self.data_dir / "questions.json")
-            run_store.save_input("responses.csv", self.data_dir / "responses.csv")
-            if self.scope:
-                run_store.save_input_text("scope.md", self.scope)
+            # 2. Save input files (copied in the background while planning)
+            # and record the dataset hash
+            self._snapshot_inputs(run_store)
             
-            # 3. Compute dataset hash
-            run_store.compute_dataset_hash(
-                self.data_dir / "questions.json",
-                self.data_dir / "responses.csv",
-                self.data_dir / "scope.md" if (self.data_dir / "scope.md").exists() else None
-            )
-            
-            # 4. Plan the cut via agent
+            # 3. Plan the cut via agent
             logger.info(f"Planning cut for: {prompt}")
-            cut_result = self.agent.plan_cut(prompt)
+            cut_result = self._plan_cut(prompt)
             
             if not cut_result.ok:
-                errors = [str(e) for e in cut_result.errors]
+                errors = _extract_errors(cut_result.errors)
                 logger.error(f"Cut planning failed: {errors}")
                 
                 # Save failure result
                 if save_run:
-                    run_store.save_artifact("cut_planning_error.json", {
+                    run_store.submit(run_store.save_artifact, "cut_planning_error.json", {
                         "prompt": prompt,
                         "errors": errors,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": run_started_at
                     })
                     run_store.save_report(PipelineResult(
                         success=False,
@@ -879,27 +666,21 @@ class Pipeline:
             cut_spec = cut_result.data
             logger.info(f"Cut planned successfully: {cut_spec.cut_id}")
 
-            # 5. Execute the cut
+            # 4. Execute the cut
             logger.info(f"Executing cut: {cut_spec.cut_id}")
             execution_result = self.agent.execute_single_cut(cut_spec)
             
-            # 6. Save artifacts and generate report
+            # 5. Save artifacts and generate report
+            run_store.flush()
             if save_run:
-                # Save cut specification
-                run_store.save_artifact("cut_spec.json", cut_spec)
-                
-                # Save execution results
-                run_store.save_artifact("execution_result.json", execution_result)
+                # Save cut specification and execution results in the
+                # background while the tables are written
+                run_store.submit(run_store.save_artifact, "cut_spec.json", cut_spec)
+                run_store.submit(run_store.save_artifact, "execution_result.json", execution_result)
                 
                 # Save individual tables as separate files
-                for i, table in enumerate(execution_result.tables):
-                    table_filename = f"table_{i}_{cut_spec.cut_id}.json"
-                    run_store.save_artifact(table_filename, table)
-                    
-                    # Also save as CSV if dataframe exists
-                    if hasattr(table, 'df') and table.df is not None:
-                        csv_filename = f"table_{i}_{cut_spec.cut_id}.csv"
-                        table.df.to_csv(run_dir / "artifacts" / csv_filename, index=False)
+                self._save_tables(run_store, execution_result.tables, cut_spec.cut_id)
+                run_store.flush()
                 
                 # Generate report
                 pipeline_result = PipelineResult(
@@ -926,9 +707,9 @@ class Pipeline:
             
             # Save error to artifacts
             if save_run and 'run_store' in locals():
-                run_store.save_artifact("pipeline_error.json", {
+                run_store.submit(run_store.save_artifact, "pipeline_error.json", {
                     "error": str(e),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": run_started_at
                 })
             
             return PipelineResult(
@@ -937,6 +718,9 @@ class Pipeline:
                 run_dir=run_dir,
                 errors=[str(e)]
             )
+        finally:
+            # Make deferred input and error-artifact writes durable
+            run_store.flush()
 
     def run_autoplan(
         self,
@@ -953,38 +737,28 @@ class Pipeline:
             PipelineResult with execution details
         """
         # 1. Initialize RunStore
-        run_store = RunStore(self.runs_dir)
-        run_id = run_store.new_run("Auto-plan: Comprehensive analysis")
-        run_dir = run_store.run_dir
+        run_store, run_id, run_dir = self._new_run("Auto-plan: Comprehensive analysis")
+        run_started_at = run_store.started_at.isoformat()
         
         logger.info(f"Starting autoplan run {run_id}")
 
         try:
-            # 2. Save input files
-            run_store.save_input("questions.json", self.data_dir / "questions.json")
-            run_store.save_input("responses.csv", self.data_dir / "responses.csv")
-            if self.scope:
-                run_store.save_input_text("scope.md", self.scope)
-            
-            # 3. Compute dataset hash
-            run_store.compute_dataset_hash(
-                self.data_dir / "questions.json",
-                self.data_dir / "responses.csv",
-                self.data_dir / "scope.md" if (self.data_dir / "scope.md").exists() else None
-            )
+            # 2. Save input files (copied in the background while planning)
+            # and record the dataset hash
+            self._snapshot_inputs(run_store)
             
-            # 4. Generate high-level plan via agent
+            # 3. Generate high-level plan via agent
             logger.info("Generating high-level analysis plan")
-            plan_result = self.agent.plan_analysis()
+            plan_result = self._plan_analysis()
             
             if not plan_result.ok:
-                errors = [str(e) for e in plan_result.errors]
+                errors = _extract_errors(plan_result.errors)
                 logger.error(f"High-level planning failed: {errors}")
                 
                 if save_run:
-                    run_store.save_artifact("planning_error.json", {
+                    run_store.submit(run_store.save_artifact, "planning_error.json", {
                         "errors": errors,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": run_started_at
                     })
                     run_store.save_report(PipelineResult(
                         success=False,
@@ -1002,71 +776,73 @@ class Pipeline:
             
             high_level_plan = plan_result.data
             logger.info(f"High-level plan generated with {len(high_level_plan.intents)} intents")
+            if save_run:
+                run_store.submit(run_store.save_artifact, "high_level_plan.json", high_level_plan)
             
-            # 5. Add suggested segments to agent
-            if hasattr(high_level_plan, 'suggested_segments') and high_level_plan.suggested_segments:
+            # 4. Add suggested segments to agent
+            if high_level_plan.suggested_segments:
                 for segment in high_level_plan.suggested_segments:
                     self.agent.add_segment(segment)
                     logger.info(f"Added suggested segment: {segment.name}")
             
-            # 6. Plan and execute cuts for each intent
+            # 5. Plan and execute cuts for each intent
             all_cuts_planned = []
             all_cuts_failed = []
             all_execution_results = []
             
-            # Sort intents by priority
-            sorted_intents = sorted(
-                high_level_plan.intents,
-                key=lambda x: {"high": 0, "medium": 1, "low": 2}.get(x.priority, 3)
-            )
+            # Order intents by priority
+            sorted_intents = _order_intents(high_level_plan.intents)
             
             # Limit to max_cuts
             intents_to_process = sorted_intents[:max_cuts]
             
-            for i, intent in enumerate(intents_to_process):
-                logger.info(f"Processing intent {i+1}/{len(intents_to_process)}: {intent.description}")
-                
-                try:
-                    # Plan cut from intent description
-                    cut_result = self.agent.plan_cut(intent.description)
-                    
-                    if cut_result.ok:
-                        cut_spec = cut_result.data
-                        all_cuts_planned.append(cut_spec)
-                        
-                        # Execute the cut
-                        exec_result = self.agent.execute_single_cut(cut_spec)
-                        all_execution_results.append(exec_result)
-                        
-                        logger.info(f"✓ Executed cut: {cut_spec.cut_id}")
-                    else:
-                        failed_cut = {
-                            "intent_id": getattr(intent, 'intent_id', f"intent_{i}"),
-                            "description": intent.description,
-                            "errors": [str(e) for e in cut_result.errors]
-                        }
-                        all_cuts_failed.append(failed_cut)
-                        logger.warning(f"✗ Failed to plan cut for intent: {intent.description}")
-                        
-                except Exception as e:
-                    failed_cut = {
-                        "intent_id": getattr(intent, 'intent_id', f"intent_{i}"),
-                        "description": intent.description,
-                        "error": str(e)
-                    }
-                    all_cuts_failed.append(failed_cut)
-                    logger.error(f"Error processing intent: {e}")
-            
-            # 7. Combine all execution results
-            combined_tables = []
-            combined_errors = []
-            segments_computed = {}
-            
-            for result in all_execution_results:
-                combined_tables.extend(result.tables)
-                combined_errors.extend(result.errors)
-                if result.segments_computed:
-                    segments_computed.update(result.segments_computed)
+            # Intents are independent LLM round trips, so plan them concurrently.
+            # Results are collected in submission order on this thread, and each
+            # intent's tables are written while later intents are still planning.
+            table_writes: list[Future] = []
+            if intents_to_process:
+                # Create the lazy agent here so worker threads share one instance
+                self.agent
+                # With DD_BATCH_PLANNING, all intents share one planning call;
+                # otherwise each worker plans its own intent
+                planned: list[Optional[ToolOutput]] = (
+                    self._plan_cuts([intent.description for intent in intents_to_process])
+                    if settings.DD_BATCH_PLANNING
+                    else [None] * len(intents_to_process)
+                )
+                workers = max(1, min(settings.DD_CUT_CONCURRENCY, len(intents_to_process)))
+                with ThreadPoolExecutor(max_workers=workers) as pool, \
+                        ThreadPoolExecutor(max_workers=4) as write_pool:
+                    futures = [
+                        pool.submit(
+                            self._plan_and_execute_intent,
+                            i, intent, len(intents_to_process), planned[i],
+                        )
+                        for i, intent in enumerate(intents_to_process)
+                    ]
+                    n_tables = 0
+                    for future in futures:
+                        cut_spec, outcome = future.result()
+                        if cut_spec is not None:
+                            all_cuts_planned.append(cut_spec)
+                            all_execution_results.append(outcome)
+                            if save_run:
+                                table_writes += self._submit_table_writes(
+                                    write_pool, run_store, outcome.tables, start=n_tables
+                                )
+                            n_tables += len(outcome.tables)
+                        else:
+                            all_cuts_failed.append(outcome)
+            
+            # 6. Combine all execution results
+            combined_tables = list(chain.from_iterable(r.tables for r in all_execution_results))
+            combined_errors = list(chain.from_iterable(r.errors for r in all_execution_results))
+            segments_computed = {
+                segment_id: base_n
+                for r in all_execution_results
+                if r.segments_computed
+                for segment_id, base_n in r.segments_computed.items()
+            }
             
             combined_execution_result = ExecutionResult(
                 tables=combined_tables,
@@ -1074,20 +850,19 @@ class Pipeline:
                 segments_computed=segments_computed
             )
             
-            # 8. Save artifacts and generate report
+            # 7. Save artifacts and generate report
+            run_store.flush()
             if save_run:
-                # Save high-level plan
-                run_store.save_artifact("high_level_plan.json", high_level_plan)
-                
-                # Save all cut specifications
-                run_store.save_artifact("all_cuts.json", all_cuts_planned)
+                # Save all cut specifications (the high-level plan was saved
+                # as soon as it was generated)
+                run_store.submit(run_store.save_artifact, "all_cuts.json", all_cuts_planned)
                 
                 # Save failed cuts
                 if all_cuts_failed:
-                    run_store.save_artifact("failed_cuts.json", all_cuts_failed)
+                    run_store.submit(run_store.save_artifact, "failed_cuts.json", all_cuts_failed)
                 
                 # Save execution summary
-                run_store.save_artifact("execution_summary.json", {
+                run_store.submit(run_store.save_artifact, "execution_summary.json", {
                     "total_intents": len(high_level_plan.intents),
                     "intents_processed": len(intents_to_process),
                     "cuts_planned": len(all_cuts_planned),
@@ -1096,15 +871,10 @@ class Pipeline:
                     "errors_encountered": len(combined_execution_result.errors)
                 })
                 
-                # Save each table
-                for i, table in enumerate(combined_execution_result.tables):
-                    table_filename = f"table_{i}_{table.cut_id}.json"
-                    run_store.save_artifact(table_filename, table)
-                    
-                    # Also save as CSV
-                    if hasattr(table, 'df') and table.df is not None:
-                        csv_filename = f"table_{i}_{table.cut_id}.csv"
-                        table.df.to_csv(run_dir / "artifacts" / csv_filename, index=False)
+                # Tables were written as each intent finished; surface any failure
+                for future in table_writes:
+                    future.result()
+                run_store.flush()
                 
                 # Generate comprehensive report
                 pipeline_result = PipelineResult(
@@ -1136,9 +906,9 @@ class Pipeline:
             logger.error(f"Autoplan pipeline failed: {str(e)}")
             
             if save_run and 'run_store' in locals():
-                run_store.save_artifact("autoplan_error.json", {
+                run_store.submit(run_store.save_artifact, "autoplan_error.json", {
                     "error": str(e),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": run_started_at
                 })
             
             return PipelineResult(
@@ -1147,6 +917,9 @@ class Pipeline:
                 run_dir=run_dir,
                 errors=[str(e)]
             )
+        finally:
+            # Make deferred input and error-artifact writes durable
+            run_store.flush()
     
     def run_interactive(
             self,
@@ -1164,7 +937,6 @@ class Pipeline:
             """
             # 1. Get prompt from user if not provided
             if not prompt:
-                console = Console()
                 prompt = console.input("\n🔍 [bold]Enter analysis request: [/bold]")
                 if not prompt.strip():
                     return PipelineResult(
@@ -1175,9 +947,8 @@ class Pipeline:
                     )
             
             # 2. Initialize RunStore
-            run_store = RunStore(self.runs_dir)
-            run_id = run_store.new_run(prompt)
-            run_dir = run_store.run_dir
+            run_store, run_id, run_dir = self._new_run(prompt)
+            run_started_at = run_store.started_at.isoformat()
             
             logger.info(f"Starting interactive run {run_id} with prompt: {prompt}")
             
@@ -1190,39 +961,19 @@ class Pipeline:
                 resolution_attempts = 0
                 max_resolution_attempts = 3
                 
-                while hasattr(cut_result, 'requires_user_input') and cut_result.requires_user_input and resolution_attempts < max_resolution_attempts:
+                while cut_result.requires_user_input and resolution_attempts < max_resolution_attempts:
                     resolution_attempts += 1
                     
-                    console = Console()
-                    console.print("\n" + "="*60)
-                    console.print("[bold yellow]🤔 AMBIGUITY DETECTED[/bold yellow]")
-                    console.print("="*60)
-                    console.print(f"Your request '[cyan]{prompt}[/cyan]' could mean multiple things:")
-                    console.print()
-                    
                     # Display options
-                    for i, option in enumerate(cut_result.user_input_options):
-                        question_id = option.get("question_id", "UNKNOWN")
-                        label = option.get("label", "No label")
-                        match_reason = option.get("match_reason", "No reason given")
-                        confidence = option.get("confidence", 0.0)
-                        
-                        console.print(f"[bold]{i+1}.[/bold] {label}")
-                        console.print(f"   [dim]Question ID: {question_id}[/dim]")
-                        console.print(f"   [dim]Match reason: {match_reason}[/dim]")
-                        console.print(f"   [dim]Confidence: {confidence:.1%}[/dim]")
-                        console.print()
-                    
-                    console.print(f"[bold]{len(cut_result.user_input_options)+1}.[/bold] Enter a different request")
-                    console.print(f"[bold]{len(cut_result.user_input_options)+2}.[/bold] Cancel analysis")
-                    console.print()
+                    n_options = len(cut_result.user_input_options)
+                    console.print(_render_ambiguity_options(prompt, cut_result.user_input_options))
                     
                     # Get user choice
                     try:
-                        choice = console.input(f"Select option (1-{len(cut_result.user_input_options)+2}): ").strip()
+                        choice = console.input(f"Select option (1-{n_options+2}): ").strip()
                         choice_num = int(choice)
                         
-                        if choice_num == len(cut_result.user_input_options) + 1:
+                        if choice_num == n_options + 1:
                             # New request
                             prompt = console.input("Enter new analysis request: ")
                             if not prompt.strip():
@@ -1234,7 +985,7 @@ class Pipeline:
                                 )
                             cut_result = self.agent.plan_cut(prompt)
                             
-                        elif choice_num == len(cut_result.user_input_options) + 2:
+                        elif choice_num == n_options + 2:
                             # Cancel
                             return PipelineResult(
                                 success=False,
@@ -1243,23 +994,16 @@ class Pipeline:
                                 errors=["Analysis cancelled by user"]
                             )
                             
-                        elif 1 <= choice_num <= len(cut_result.user_input_options):
+                        elif 1 <= choice_num <= n_options:
                             # User selected an option
                             selected_index = choice_num - 1
                             logger.info(f"User selected option {choice_num}: {cut_result.user_input_options[selected_index].get('question_id')}")
                             
                             # Resolve with selected option
-                            # First, we need to ensure agent has resolve_ambiguity_and_plan method
-                            if hasattr(self.agent, 'resolve_ambiguity_and_plan'):
-                                cut_result = self.agent.resolve_ambiguity_and_plan(prompt, selected_index)
-                            else:
-                                # Fallback: create modified prompt with selection
-                                selected_question_id = cut_result.user_input_options[selected_index].get('question_id')
-                                modified_prompt = f"{prompt} (use question: {selected_question_id})"
-                                cut_result = self.agent.plan_cut(modified_prompt)
+                            cut_result = self.agent.resolve_ambiguity_and_plan(prompt, selected_index)
                             
                         else:
-                            console.print(f"[red]Invalid choice. Please enter 1-{len(cut_result.user_input_options)+2}[/red]")
+                            console.print(f"[red]Invalid choice. Please enter 1-{n_options+2}[/red]")
                             continue
                             
                     except ValueError:
@@ -1276,19 +1020,14 @@ class Pipeline:
                         )
                 
                 # 5. Check if we still have ambiguity after attempts
-                if hasattr(cut_result, 'requires_user_input') and cut_result.requires_user_input:
+                if cut_result.requires_user_input:
                     console.print("\n[bold yellow]⚠️  Too many resolution attempts. Using highest confidence option.[/bold yellow]")
                     # Use first (highest confidence) option
-                    if hasattr(self.agent, 'resolve_ambiguity_and_plan'):
-                        cut_result = self.agent.resolve_ambiguity_and_plan(prompt, 0)
-                    else:
-                        selected_question_id = cut_result.user_input_options[0].get('question_id')
-                        modified_prompt = f"{prompt} (use question: {selected_question_id})"
-                        cut_result = self.agent.plan_cut(modified_prompt)
+                    cut_result = self.agent.resolve_ambiguity_and_plan(prompt, 0)
                 
                 # 6. Process the final cut result
                 if not cut_result.ok:
-                    errors = [str(e) for e in cut_result.errors]
+                    errors = _extract_errors(cut_result.errors)
                     logger.error(f"Cut planning failed: {errors}")
                     
                     if save_run:
@@ -1296,7 +1035,7 @@ class Pipeline:
                             "prompt": prompt,
                             "errors": errors,
                             "interactive": True,
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": run_started_at
                         })
                     
                     return PipelineResult(
@@ -1315,18 +1054,9 @@ class Pipeline:
                 
                 # 8. Save artifacts and generate report
                 if save_run:
-                    # Save input files
-                    run_store.save_input("questions.json", self.data_dir / "questions.json")
-                    run_store.save_input("responses.csv", self.data_dir / "responses.csv")
-                    if self.scope:
-                        run_store.save_input_text("scope.md", self.scope)
-                    
-                    # Compute dataset hash
-                    run_store.compute_dataset_hash(
-                        self.data_dir / "questions.json",
-                        self.data_dir / "responses.csv",
-                        self.data_dir / "scope.md" if (self.data_dir / "scope.md").exists() else None
-                    )
+                    # Save input files and dataset hash
+                    self._snapshot_inputs(run_store)
+                    run_store.flush()
                     
                     # Save cut specification
                     run_store.save_artifact("cut_spec.json", cut_spec)
@@ -1335,7 +1065,7 @@ class Pipeline:
                     run_store.save_artifact("execution_result.json", execution_result)
                     
                     # Save interaction trace
-                    if hasattr(cut_result, 'trace') and cut_result.trace:
+                    if cut_result.trace:
                         run_store.save_artifact("interaction_trace.json", {
                             "original_prompt": prompt,
                             "resolution_attempts": resolution_attempts,
@@ -1344,13 +1074,7 @@ class Pipeline:
                         })
                     
                     # Save individual tables
-                    for i, table in enumerate(execution_result.tables):
-                        table_filename = f"table_{i}_{cut_spec.cut_id}.json"
-                        run_store.save_artifact(table_filename, table)
-                        
-                        if hasattr(table, 'df') and table.df is not None:
-                            csv_filename = f"table_{i}_{cut_spec.cut_id}.csv"
-                            table.df.to_csv(run_dir / "artifacts" / csv_filename, index=False)
+                    self._save_tables(run_store, execution_result.tables, cut_spec.cut_id)
                     
                     # Generate report
                     pipeline_result = PipelineResult(
@@ -1378,7 +1102,7 @@ class Pipeline:
                 if save_run and 'run_store' in locals():
                     run_store.save_artifact("interactive_error.json", {
                         "error": str(e),
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": run_started_at
                     })
                 
                 return PipelineResult(
@@ -0,0 +1,112 @@
+"""On-disk cache for LLM-planned specifications."""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Generic, Optional, TypeVar
+from uuid import uuid4
+
+from pydantic import BaseModel, ValidationError
+
+T = TypeVar("T", bound=BaseModel)
+
+DEFAULT_TTL_S = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+
+def plan_fingerprint(prompt: str, dataset_hash: str) -> str:
+    """Compute the cache key for a prompt planned against a dataset.
+
+    Args:
+        prompt: Natural language request (normalized for case and whitespace)
+        dataset_hash: Identifier of the dataset the plan refers to
+
+    Returns:
+        SHA-256 hex digest
+    """
+    normalized = prompt.strip().lower()
+    return hashlib.sha256(f"{normalized}|{dataset_hash}".encode("utf-8")).hexdigest()
+
+
+class PlanCache(Generic[T]):
+    """Cache of planned models stored as one JSON file per fingerprint.
+
+    Entries expire after ``ttl_s`` seconds. When the directory grows past
+    ``max_bytes`` the least recently used entries (by mtime) are evicted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        model_type: type[T],
+        ttl_s: float = DEFAULT_TTL_S,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            model_type: Pydantic model stored in the cache
+            ttl_s: Entry lifetime in seconds
+            max_bytes: Maximum total size of the cache directory
+        """
+        self.cache_dir = Path(cache_dir)
+        self.model_type = model_type
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+
+    def _path(self, fingerprint: str) -> Path:
+        """Get the file path for a fingerprint."""
+        return self.cache_dir / f"{fingerprint}.json"
+
+    def get(self, fingerprint: str) -> Optional[T]:
+        """Get a cached model, or None if missing, expired or unreadable."""
+        path = self._path(fingerprint)
+        try:
+            age = time.time() - path.stat().st_mtime
+            if age > self.ttl_s:
+                path.unlink(missing_ok=True)
+                return None
+            model = self.model_type.model_validate_json(path.read_bytes())
+        except (OSError, ValidationError):
+            return None
+
+        # Refresh mtime so eviction is least-recently-used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return model
+
+    def put(self, fingerprint: str, model: T) -> None:
+        """Store a model under a fingerprint."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Write to a unique temp file, then atomically move into place
+        tmp_path = self.cache_dir / f".{fingerprint}.{uuid4().hex}.tmp"
+        tmp_path.write_text(model.model_dump_json())
+        os.replace(tmp_path, self._path(fingerprint))
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove expired entries and trim the directory to max_bytes."""
+        now = time.time()
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.ttl_s:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
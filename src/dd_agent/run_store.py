@@ -1,13 +1,52 @@
 """Run storage for persisting execution artifacts."""
 
 import json
+import os
 import shutil
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from uuid import uuid4
 
-from dd_agent.util.hashing import hash_dataset
+from dd_agent.util.hashing import hash_dataset, hash_file_cached
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize values JSON doesn't handle natively.
+
+    Pydantic models (e.g. raw LLM responses kept in tool traces) are dumped
+    here, at write time; anything else falls back to str().
+    """
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize data as indented JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=_json_default,
+            option=orjson.OPT_INDENT_2
+            | orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(data, indent=2, default=_json_default).encode("utf-8")
+
+
+def _load_json_file(path: Path) -> Any:
+    """Read a JSON file, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path) as f:
+        return json.load(f)
 
 
 class RunStore:
@@ -43,6 +82,11 @@ class RunStore:
         self.inputs_dir: Optional[Path] = None
         self.artifacts_dir: Optional[Path] = None
         self.dataset_hash: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+
+        # Single writer thread for deferred writes (see submit/flush)
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._pending: list[Future] = []
 
     def new_run(self, prompt: Optional[str] = None) -> str:
         """Create a new run directory.
@@ -53,8 +97,9 @@ class RunStore:
         Returns:
             The run ID
         """
-        # Generate run ID
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H-%M-%SZ")
+        # Generate run ID from the UTC start time, also used for metadata
+        self.started_at = datetime.now(timezone.utc)
+        timestamp = self.started_at.strftime("%Y-%m-%dT%H-%M-%SZ")
         short_id = uuid4().hex[:8]
         self.run_id = f"{timestamp}_{short_id}"
 
@@ -70,13 +115,39 @@ class RunStore:
         # Save initial metadata
         metadata = {
             "run_id": self.run_id,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": self.started_at.isoformat(),
             "prompt": prompt,
         }
         self._save_json(self.run_dir / "metadata.json", metadata)
 
         return self.run_id
 
+    def submit(self, write: Callable[..., Any], *args: Any) -> None:
+        """Run a write on the background writer thread.
+
+        Writes run one at a time in submission order. Call flush() before
+        relying on them being on disk.
+
+        Args:
+            write: Write method to call, e.g. ``self.save_artifact``
+            *args: Arguments for the write
+        """
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="run-store"
+            )
+        self._pending.append(self._writer.submit(write, *args))
+
+    def flush(self) -> None:
+        """Wait for all submitted writes, re-raising the first failure."""
+        pending, self._pending = self._pending, []
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        wait(pending)
+        for future in pending:
+            future.result()
+
     def save_input(self, name: str, source_path: Path) -> None:
         """Copy an input file to the run's inputs directory.
 
@@ -87,8 +158,39 @@ class RunStore:
         if self.inputs_dir is None:
             raise RuntimeError("No active run. Call new_run() first.")
 
+        # copyfile skips permission copying and uses the kernel's
+        # zero-copy path (sendfile/copy_file_range) where available
+        dest = self.inputs_dir / name
+        shutil.copyfile(source_path, dest)
+
+    def save_input_cached(self, name: str, source_path: Path) -> None:
+        """Link an input file into the run from a content-addressed store.
+
+        Each distinct file content is copied once to ``runs_dir/.blobs``;
+        runs hard-link to that copy (or copy it where links aren't possible).
+
+        Args:
+            name: Name to save the file as
+            source_path: Path to the source file
+        """
+        if self.inputs_dir is None:
+            raise RuntimeError("No active run. Call new_run() first.")
+
+        blobs_dir = self.runs_dir / ".blobs"
+        blobs_dir.mkdir(exist_ok=True)
+        digest = hash_file_cached(blobs_dir / "index.json", source_path)
+        blob = blobs_dir / digest
+        if not blob.exists():
+            tmp_path = blobs_dir / f".{digest}.{uuid4().hex}.tmp"
+            shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, blob)
+
         dest = self.inputs_dir / name
-        shutil.copy(source_path, dest)
+        try:
+            os.link(blob, dest)
+        except OSError:
+            # e.g. filesystems without hard links
+            shutil.copyfile(blob, dest)
 
     def save_input_text(self, name: str, content: str) -> None:
         """Save text content as an input file.
@@ -131,6 +233,7 @@ class RunStore:
         questions_path: Path,
         responses_path: Path,
         scope_path: Optional[Path] = None,
+        digest: Optional[str] = None,
     ) -> str:
         """Compute and store the dataset hash.
 
@@ -138,18 +241,21 @@ class RunStore:
             questions_path: Path to questions.json
             responses_path: Path to responses.csv
             scope_path: Optional path to scope.md
+            digest: Precomputed hash of the same files (skips re-reading them)
 
         Returns:
             The computed hash
         """
-        self.dataset_hash = hash_dataset(questions_path, responses_path, scope_path)
+        if digest is not None:
+            self.dataset_hash = digest
+        else:
+            self.dataset_hash = hash_dataset(questions_path, responses_path, scope_path)
 
         # Update metadata
         if self.run_dir:
             metadata_path = self.run_dir / "metadata.json"
             if metadata_path.exists():
-                with open(metadata_path) as f:
-                    metadata = json.load(f)
+                metadata = _load_json_file(metadata_path)
                 metadata["dataset_hash"] = self.dataset_hash
                 self._save_json(metadata_path, metadata)
 
@@ -235,8 +341,7 @@ class RunStore:
 
     def _save_json(self, path: Path, data: Any) -> None:
         """Save data as JSON."""
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        path.write_bytes(_dumps(data))
 
     def list_runs(self) -> list[dict[str, Any]]:
         """List all runs in the runs directory.
@@ -249,8 +354,7 @@ class RunStore:
             if run_dir.is_dir():
                 metadata_path = run_dir / "metadata.json"
                 if metadata_path.exists():
-                    with open(metadata_path) as f:
-                        metadata = json.load(f)
+                    metadata = _load_json_file(metadata_path)
                     metadata["run_dir"] = str(run_dir)
                     runs.append(metadata)
         return runs
@@ -1,5 +1,6 @@
 """Base classes for tools."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -7,12 +8,33 @@ from typing import Any, Optional, TypeVar
 
 import pandas as pd
 
+from dd_agent.config import settings
 from dd_agent.contracts.questions import Question
 from dd_agent.contracts.specs import SegmentSpec
 from dd_agent.contracts.tool_output import ToolOutput
 
 T = TypeVar("T")
 
+# Hashable form of a question catalog: (question_id, label, type value,
+# ((option code, option label), ...)) per question
+CatalogKey = tuple[tuple[str, str, str, tuple[tuple[str | int, str], ...]], ...]
+
+
+def catalog_key(questions: list[Question]) -> CatalogKey:
+    """Reduce a question catalog to the fields tools show the LLM.
+
+    Used to cache prompts rendered from the catalog.
+    """
+    return tuple(
+        (
+            q.question_id,
+            q.label,
+            q.type.value,
+            tuple((opt.code, opt.label) for opt in (q.options or ())),
+        )
+        for q in questions
+    )
+
 
 @dataclass
 class ToolContext:
@@ -123,6 +145,36 @@ class Tool(ABC):
         """
         pass
 
+    async def run_async(self, ctx: ToolContext) -> ToolOutput[Any]:
+        """Execute the tool without blocking the event loop.
+
+        The LLM client is synchronous, so run() executes on a worker thread.
+        """
+        return await asyncio.to_thread(self.run, ctx)
+
+    async def run_many(
+        self,
+        ctxs: list[ToolContext],
+        max_concurrency: Optional[int] = None,
+    ) -> list[ToolOutput[Any]]:
+        """Execute the tool for several contexts concurrently.
+
+        Args:
+            ctxs: Tool contexts, e.g. one per prompt
+            max_concurrency: Maximum runs in flight at once (defaults to
+                settings.DD_CUT_CONCURRENCY)
+
+        Returns:
+            One ToolOutput per context, in the same order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.DD_CUT_CONCURRENCY)
+
+        async def run_one(ctx: ToolContext) -> ToolOutput[Any]:
+            async with semaphore:
+                return await self.run_async(ctx)
+
+        return list(await asyncio.gather(*(run_one(ctx) for ctx in ctxs)))
+
     def _load_prompt(self, filename: str) -> str:
         """Load a prompt template from the prompts directory."""
         prompt_dir = Path(__file__).parent.parent / "llm" / "prompts"
@@ -1,15 +1,19 @@
 """Cut planner tool for converting NL requests to CutSpecs."""
 
 import json
-import uuid
+import re
+from functools import lru_cache
+from operator import attrgetter
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
-from dd_agent.contracts.specs import CutSpec, MetricSpec
+from dd_agent.config import settings
+from dd_agent.contracts.specs import CutSpec, DimensionSpec, MetricSpec, SegmentSpec
 from dd_agent.contracts.tool_output import ToolMessage, ToolOutput, err, warn
-from dd_agent.contracts.validate import validate_cut_spec
+from dd_agent.contracts.validate import METRIC_TYPE_COMPATIBILITY, validate_cut_spec
 from dd_agent.llm.structured import build_messages, chat_structured_pydantic
-from dd_agent.tools.base import Tool, ToolContext
+from dd_agent.tools.base import CatalogKey, Tool, ToolContext, catalog_key
+from dd_agent.util.hashing import short_hash
 
 
 class AmbiguityOption(BaseModel):
@@ -31,212 +35,21 @@ class CutPlanResult(BaseModel):
     errors: List[Dict[str, Any]] = Field(default_factory=list, description="Any errors from the LLM")
 
 
-class CutPlanner(Tool):
-    """Tool for converting natural language requests to CutSpecs.
-
-    Takes a natural language analysis request (e.g., "Show NPS by region")
-    and produces a validated CutSpec that can be executed deterministically.
-    """
-
-    @property
-    def name(self) -> str:
-        return "cut_planner"
-
-    @property
-    def description(self) -> str:
-        return "Converts natural language analysis requests to executable CutSpecs"
+class BatchedCutPlanResult(BaseModel):
+    """Results of planning several requests in one call, in request order."""
+    results: List[CutPlanResult] = Field(..., description="One result per request, in request order")
 
-    def run(self, ctx: ToolContext) -> ToolOutput[CutSpec]:
-        """Execute the cut planner tool.
 
-        Args:
-            ctx: Tool context with questions, segments, and the prompt
-
-        Returns:
-            ToolOutput containing a validated CutSpec or errors
-        """
-        if not ctx.prompt:
-            return ToolOutput.failure(
-                errors=[err("missing_prompt", "No analysis request provided")]
-            )
-
-        try:
-            # 1. Prepare context information
-            user_content = self._build_user_content(ctx)
-            
-            # 2. Build system prompt
-            system_prompt = self._build_system_prompt(ctx)
-            
-            # 3. Call LLM to generate structured output
-            messages = build_messages(
-                system_prompt=system_prompt,
-                user_content=user_content
-            )
-            
-            # 4. Get LLM response
-            cut_plan, llm_trace = chat_structured_pydantic(
-                messages=messages,
-                model=CutPlanResult,
-                temperature=0.1
-            )
-            
-            # 5. Process LLM response
-            if not cut_plan.ok:
-                # Convert error dicts to ToolMessage objects
-                error_messages = []
-                for error_dict in cut_plan.errors:
-                    error_messages.append(ToolMessage(
-                        code=error_dict.get("code", "llm_error"),
-                        message=error_dict.get("message", "Unknown LLM error"),
-                        context=error_dict.get("context", {})
-                    ))
-                
-                return ToolOutput.failure(
-                    errors=error_messages,
-                    trace={
-                        "prompt": ctx.prompt,
-                        "llm_response": cut_plan.model_dump(),
-                        "llm_trace": llm_trace
-                    }
-                )
-            
-            # 6. Check if user resolution is needed
-            if cut_plan.requires_user_resolution and len(cut_plan.ambiguity_options) > 1:
-                # Sort by confidence
-                sorted_options = sorted(
-                    cut_plan.ambiguity_options, 
-                    key=lambda x: x.confidence, 
-                    reverse=True
-                )
-                
-                # Prepare user input options
-                user_options = []
-                for opt in sorted_options:
-                    user_options.append({
-                        "question_id": opt.question_id,
-                        "label": opt.label,
-                        "match_reason": opt.match_reason,
-                        "confidence": opt.confidence,
-                        "question_type": opt.question_type
-                    })
-                
-                # Return partial result requiring user input
-                return ToolOutput.partial_for_user_input(
-                    prompt=f"Your request '{ctx.prompt}' could mean multiple things. Which one do you mean?",
-                    options=user_options,
-                    trace={
-                        "prompt": ctx.prompt,
-                        "ambiguity_options": [opt.model_dump() for opt in sorted_options],
-                        "resolution_map": cut_plan.resolution_map,
-                        "llm_trace": llm_trace
-                    }
-                )
-            
-            # 7. If no ambiguity or cut already generated, validate
-            if cut_plan.cut:
-                # Generate cut_id if missing
-                if not cut_plan.cut.cut_id:
-                    cut_plan.cut.cut_id = f"cut_{uuid.uuid4().hex[:8]}"
-                
-                # Validate using the existing validate_cut_spec function
-                questions_by_id = {q.question_id: q for q in ctx.questions}
-                segments_by_id = {s.segment_id: s for s in (ctx.segments or [])}
-                
-                validation_errors = validate_cut_spec(
-                    cut_plan.cut, 
-                    questions_by_id, 
-                    segments_by_id
-                )
-                
-                if validation_errors:
-                    # Convert validation errors to ToolMessage format
-                    tool_errors = []
-                    for error_item in validation_errors:
-                        # Handle different error formats
-                        if isinstance(error_item, dict):
-                            tool_errors.append(ToolMessage(
-                                code=error_item.get("code", "validation_error"),
-                                message=error_item.get("message", "Validation failed"),
-                                context=error_item.get("context", {})
-                            ))
-                        elif isinstance(error_item, ToolMessage):
-                            tool_errors.append(error_item)
-                        else:
-                            # Fallback
-                            tool_errors.append(err("validation_error", str(error_item)))
-                    
-                    return ToolOutput.failure(
-                        errors=tool_errors,
-                        trace={
-                            "prompt": ctx.prompt,
-                            "validation_errors": validation_errors,
-                            "llm_trace": llm_trace
-                        }
-                    )
-                
-                return ToolOutput.success(
-                    data=cut_plan.cut,
-                    warnings=[ToolMessage(
-                        code="resolution_mapped", 
-                        message=f"Mapped terms: {cut_plan.resolution_map}"
-                    )] if cut_plan.resolution_map else [],
-                    trace={
-                        "prompt": ctx.prompt,
-                        "resolution_map": cut_plan.resolution_map,
-                        "llm_response": cut_plan.model_dump(),
-                        "llm_trace": llm_trace,
-                        "validation_passed": True
-                    }
-                )
-            else:
-                # No cut generated and no ambiguity? This shouldn't happen
-                return ToolOutput.failure(
-                    errors=[err("no_cut_generated", "LLM did not generate a CutSpec")]
-                )
-                
-        except Exception as e:
-            return ToolOutput.failure(
-                errors=[err("unexpected_error", f"Unexpected error: {str(e)}")]
-            )
-
-    def _build_system_prompt(self, ctx: ToolContext) -> str:
-        """Build the system prompt to guide LLM reasoning."""
-        
-        # Build string representation of question catalog
-        questions_info = []
-        for q in ctx.questions:
-            # Use question_id from the Question class
-            question_desc = f"- ID: {q.question_id}, Label: '{q.label}', Type: {q.type.value}"
-            if q.options:
-                # Handle numeric option codes for Likert
-                option_strings = []
-                for opt in q.options:
-                    # Show both code and label
-                    option_strings.append(f"'{opt.code}': '{opt.label}'")
-                options_str = ", ".join(option_strings)
-                question_desc += f", Options: {{{options_str}}}"
-            questions_info.append(question_desc)
-        
-        questions_str = "\n".join(questions_info)
-        
-        # Build segment catalog (if available)
-        segments_str = ""
-        if ctx.segments:
-            segments_info = []
-            for s in ctx.segments:
-                segment_desc = f"- ID: {s.segment_id}, Name: '{s.name}'"
-                # Add filter description if available
-                if hasattr(s, 'definition') and s.definition:
-                    segment_desc += f", Definition: {s.definition}"
-                segments_info.append(segment_desc)
-            segments_str = "\nAvailable Segments:\n" + "\n".join(segments_info)
-        
-        return f"""You are a data analysis expert responsible for converting natural language analysis requests into precise CutSpec specifications.
+# Fixed parts of the system prompt; only the catalog between them varies
+_PROMPT_HEADER = """You are a data analysis expert responsible for converting natural language analysis requests into precise CutSpec specifications.
 
 # Available Data
-Here are the questions in the dataset:
-{questions_str}
-{segments_str}
+Here are the questions in the dataset, one per line (tab-separated;
+options are code=label pairs separated by ';'):
+id\tlabel\ttype\toptions
+"""
+
+_STATIC_PROMPT_TAIL = """
 
 # Task
 Parse the user's natural language request into a CutSpec containing:
@@ -296,25 +109,25 @@ Common mappings:
 
 ## 6. Output Format
 You must return a CutPlanResult object with this exact structure:
-{{
+{
     "ok": true,
-    "cut": {{
+    "cut": {
         "cut_id": "suggested_id_here",
-        "metric": {{
+        "metric": {
             "type": "metric_type",
             "question_id": "QUESTION_ID",
-            "params": {{}}  # Always include params, can be empty or contain e.g. "top_values": [4, 5]
-        }},
+            "params": {}  # Always include params, can be empty or contain e.g. "top_values": [4, 5]
+        },
         "dimensions": [
-            {{"kind": "question", "id": "QUESTION_ID"}}
+            {"kind": "question", "id": "QUESTION_ID"}
         ],
         "filter": null
-    }},
-    "resolution_map": {{"user_term": "actual_id"}},
+    },
+    "resolution_map": {"user_term": "actual_id"},
     "ambiguity_options": [],
     "requires_user_resolution": false,
     "errors": []
-}}
+}
 
 # Critical Instructions
 1. Check for ambiguity FIRST - if multiple matches, set requires_user_resolution=true
@@ -329,66 +142,501 @@ You must return a CutPlanResult object with this exact structure:
 Example 1: Ambiguous request
 User: "Show satisfaction by region"
 Available: Q_OVERALL_SAT (likert_1_5), Q_SUPPORT_SAT (likert_1_5), Q_REGION (single_choice)
-Response: {{
+Response: {
     "ok": true,
     "cut": null,
-    "resolution_map": {{"satisfaction": "multiple_possible", "region": "Q_REGION"}},
+    "resolution_map": {"satisfaction": "multiple_possible", "region": "Q_REGION"},
     "ambiguity_options": [
-        {{
+        {
             "question_id": "Q_OVERALL_SAT",
             "label": "Overall, how satisfied are you with our product?",
             "match_reason": "User said 'satisfaction', this is overall satisfaction question",
             "confidence": 0.8,
             "question_type": "likert_1_5"
-        }},
-        {{
+        },
+        {
             "question_id": "Q_SUPPORT_SAT",
             "label": "How satisfied are you with our customer support?",
             "match_reason": "User said 'satisfaction', this is support satisfaction question",
             "confidence": 0.6,
             "question_type": "likert_1_5"
-        }}
+        }
     ],
     "requires_user_resolution": true,
     "errors": []
-}}
+}
 
 Example 2: Clear request
-User: "Show NPS by region"
-Available: Q_NPS (nps_0_10), Q_REGION (single_choice)
-Response: {{
-    "ok": true,
-    "cut": {{
-        "cut_id": "cut_nps_by_region",
-        "metric": {{"type": "nps", "question_id": "Q_NPS", "params": {{}}}},
-        "dimensions": [{{"kind": "question", "id": "Q_REGION"}}],
-        "filter": null
-    }},
-    "resolution_map": {{"nps": "Q_NPS", "region": "Q_REGION"}},
-    "ambiguity_options": [],
-    "requires_user_resolution": false,
-    "errors": []
-}}
-
-Example 3: Top-2-box request
 User: "Top 2 box satisfaction by income level"
 Available: Q_OVERALL_SAT (likert_1_5), Q_INCOME (single_choice)
-Response: {{
+Response: {
     "ok": true,
-    "cut": {{
+    "cut": {
         "cut_id": "cut_top2box_sat_by_income",
-        "metric": {{"type": "top2box", "question_id": "Q_OVERALL_SAT", "params": {{"top_values": [4, 5]}}}},
-        "dimensions": [{{"kind": "question", "id": "Q_INCOME"}}],
+        "metric": {"type": "top2box", "question_id": "Q_OVERALL_SAT", "params": {"top_values": [4, 5]}},
+        "dimensions": [{"kind": "question", "id": "Q_INCOME"}],
         "filter": null
-    }},
-    "resolution_map": {{"top 2 box satisfaction": "Q_OVERALL_SAT", "income level": "Q_INCOME"}},
+    },
+    "resolution_map": {"top 2 box satisfaction": "Q_OVERALL_SAT", "income level": "Q_INCOME"},
     "ambiguity_options": [],
     "requires_user_resolution": false,
     "errors": []
-}}
+}
 
 Now process the user request below."""
 
+
+_SegmentsKey = tuple[tuple[str, str, str], ...]
+
+
+def _segments_key(segments: Optional[List[SegmentSpec]]) -> _SegmentsKey:
+    """Reduce a segment catalog to the fields shown in the system prompt."""
+    return tuple(
+        (s.segment_id, s.name, str(s.definition) if s.definition else "")
+        for s in (segments or ())
+    )
+
+
+def _format_question(
+    question_id: str,
+    label: str,
+    type_value: str,
+    options: tuple[tuple[str | int, str], ...],
+) -> str:
+    """Format one catalog entry as a tab-separated line of the system prompt."""
+    # Show both code and label
+    options_str = ";".join(f"{code}={opt_label}" for code, opt_label in options)
+    return f"{question_id}\t{label}\t{type_value}\t{options_str}"
+
+
+@lru_cache(maxsize=32)
+def _render_system_prompt(catalog: CatalogKey, segments_key: _SegmentsKey) -> str:
+    """Render the cut planner system prompt for a catalog.
+
+    The keys carry everything the prompt shows, so repeated requests over
+    the same dataset reuse one rendered prompt.
+
+    Args:
+        catalog: Question catalog from catalog_key
+        segments_key: Segment catalog from _segments_key
+
+    Returns:
+        System prompt text
+    """
+    # Build string representation of question catalog
+    questions_str = "\n".join(_format_question(*entry) for entry in catalog)
+
+    # Build segment catalog (if available)
+    segments_str = ""
+    if segments_key:
+        segments_info = []
+        for segment_id, name, definition in segments_key:
+            segment_desc = f"- ID: {segment_id}, Name: '{name}'"
+            if definition:
+                segment_desc += f", Definition: {definition}"
+            segments_info.append(segment_desc)
+        segments_str = "\nAvailable Segments:\n" + "\n".join(segments_info)
+
+    return "".join(
+        (_PROMPT_HEADER, questions_str, "\n", segments_str, _STATIC_PROMPT_TAIL)
+    )
+
+
+# Keyword planner: phrases naming a metric, longest first so "top 2 box"
+# isn't read as something shorter
+_METRIC_KEYWORDS = {
+    "net promoter score": "nps",
+    "bottom two box": "bottom2box",
+    "bottom 2 box": "bottom2box",
+    "top two box": "top2box",
+    "top 2 box": "top2box",
+    "frequencies": "frequency",
+    "distribution": "frequency",
+    "bottom2box": "bottom2box",
+    "frequency": "frequency",
+    "top2box": "top2box",
+    "average": "mean",
+    "mean": "mean",
+    "nps": "nps",
+}
+
+# Words that carry no meaning for the keyword planner
+_FILLER_WORDS = frozenset({
+    "show", "me", "give", "get", "calculate", "compute", "display", "what",
+    "is", "the", "of", "a", "an", "please", "score", "broken", "down", "split",
+})
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_BY_RE = re.compile(r"\bby\b")
+
+
+def _words(text: str) -> list[str]:
+    """Split text into lowercase alphanumeric words."""
+    return _WORD_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=32)
+def _keyword_index(catalog: CatalogKey) -> tuple[tuple[str, str, frozenset[str]], ...]:
+    """Index each question by the words of its ID and label.
+
+    Returns:
+        (question_id, type value, words) per question
+    """
+    index = []
+    for question_id, label, type_value, _ in catalog:
+        id_words = [w for w in _words(question_id) if w != "q"]
+        index.append((question_id, type_value, frozenset(id_words) | frozenset(_words(label))))
+    return tuple(index)
+
+
+def _extract_metric(words: list[str]) -> Optional[tuple[str, list[str]]]:
+    """Find the single metric named in a phrase.
+
+    Returns:
+        (metric type, remaining words), or None unless exactly one metric
+        type is named
+    """
+    padded = f" {' '.join(words)} "
+    found = set()
+    for phrase, metric_type in _METRIC_KEYWORDS.items():
+        while f" {phrase} " in padded:
+            padded = padded.replace(f" {phrase} ", " ", 1)
+            found.add(metric_type)
+    if len(found) != 1:
+        return None
+    return found.pop(), padded.split()
+
+
+def _unique(matches: list[str]) -> Optional[str]:
+    """Return the only match, or None if there are none or several."""
+    return matches[0] if len(matches) == 1 else None
+
+
+class CutPlanner(Tool):
+    """Tool for converting natural language requests to CutSpecs.
+
+    Takes a natural language analysis request (e.g., "Show NPS by region")
+    and produces a validated CutSpec that can be executed deterministically.
+    """
+
+    @property
+    def name(self) -> str:
+        return "cut_planner"
+
+    @property
+    def description(self) -> str:
+        return "Converts natural language analysis requests to executable CutSpecs"
+
+    def run(self, ctx: ToolContext) -> ToolOutput[CutSpec]:
+        """Execute the cut planner tool.
+
+        Args:
+            ctx: Tool context with questions, segments, and the prompt
+
+        Returns:
+            ToolOutput containing a validated CutSpec or errors
+        """
+        if not ctx.prompt:
+            return ToolOutput.failure(
+                errors=[err("missing_prompt", "No analysis request provided")]
+            )
+
+        # Simple requests may not need the LLM at all
+        planned = self._try_deterministic_plan(ctx)
+        if planned is not None:
+            return planned
+
+        try:
+            # 1. Prepare context information
+            user_content = self._build_user_content(ctx)
+            
+            # 2. Build system prompt
+            system_prompt = self._build_system_prompt(ctx)
+            
+            # 3. Call LLM to generate structured output
+            messages = build_messages(
+                system_prompt=system_prompt,
+                user_content=user_content
+            )
+            
+            # 4. Get LLM response
+            cut_plan, llm_trace = chat_structured_pydantic(
+                messages=messages,
+                model=CutPlanResult,
+                temperature=0.0,  # Greedy: the schema leaves no room for creativity
+                model_tier="small"  # Bounded choice from the catalog
+            )
+            
+            return self._process_plan(ctx, cut_plan, llm_trace)
+
+        except Exception as e:
+            return ToolOutput.failure(
+                errors=[err("unexpected_error", f"Unexpected error: {str(e)}")]
+            )
+
+    def run_batch(self, ctxs: List[ToolContext]) -> List[ToolOutput[CutSpec]]:
+        """Plan several requests over the same catalog in one LLM call.
+
+        The shared system prompt is sent once and the requests are numbered
+        in the user message. Falls back to one run() per request when the
+        contexts use different catalogs, the call fails, or the response
+        doesn't hold exactly one result per request.
+
+        Args:
+            ctxs: Tool contexts, each with a prompt
+
+        Returns:
+            One ToolOutput per context, in input order
+        """
+        # Only send the requests the keyword planner can't handle
+        outputs = [self._try_deterministic_plan(ctx) for ctx in ctxs]
+        pending = [i for i, output in enumerate(outputs) if output is None]
+        for i, output in zip(pending, self._plan_batch([ctxs[i] for i in pending])):
+            outputs[i] = output
+        return outputs
+
+    def _plan_batch(self, ctxs: List[ToolContext]) -> List[ToolOutput[CutSpec]]:
+        """Plan requests over the same catalog in one LLM call (see run_batch)."""
+        catalogs = {
+            (catalog_key(ctx.questions), _segments_key(ctx.segments)) for ctx in ctxs
+        }
+        if len(ctxs) < 2 or len(catalogs) > 1 or not all(ctx.prompt for ctx in ctxs):
+            return [self.run(ctx) for ctx in ctxs]
+
+        try:
+            messages = build_messages(
+                system_prompt=self._build_system_prompt(ctxs[0]),
+                user_content=self._build_batch_user_content(ctxs)
+            )
+            batch, llm_trace = chat_structured_pydantic(
+                messages=messages,
+                model=BatchedCutPlanResult,
+                temperature=0.0,
+                model_tier="small"
+            )
+        except Exception:
+            return [self.run(ctx) for ctx in ctxs]
+
+        if len(batch.results) != len(ctxs):
+            return [self.run(ctx) for ctx in ctxs]
+
+        outputs = []
+        for ctx, cut_plan in zip(ctxs, batch.results):
+            try:
+                outputs.append(self._process_plan(ctx, cut_plan, llm_trace))
+            except Exception as e:
+                outputs.append(ToolOutput.failure(
+                    errors=[err("unexpected_error", f"Unexpected error: {str(e)}")]
+                ))
+        return outputs
+
+    def _try_deterministic_plan(self, ctx: ToolContext) -> Optional[ToolOutput[CutSpec]]:
+        """Plan a "<metric> [<question>] [by <dimension>]" request by keywords.
+
+        Only used when DD_KEYWORD_PLANNER is set. Returns None, leaving the
+        request to the LLM, unless the metric, its question and the dimension
+        each match exactly one candidate and the resulting cut validates.
+        Requests the LLM might flag as ambiguous match several candidates.
+
+        Args:
+            ctx: Tool context with questions, segments, and the prompt
+
+        Returns:
+            ToolOutput with the planned CutSpec, or None
+        """
+        if not settings.DD_KEYWORD_PLANNER or not ctx.prompt:
+            return None
+
+        parts = _BY_RE.split(ctx.prompt.lower())
+        if len(parts) > 2:
+            return None
+        extracted = _extract_metric(_words(parts[0]))
+        if extracted is None:
+            return None
+        metric_type, rest = extracted
+        subject = [w for w in rest if w not in _FILLER_WORDS]
+
+        index = _keyword_index(catalog_key(ctx.questions))
+        if subject:
+            # The question named alongside the metric; if its type doesn't
+            # suit the metric, validation below rejects the cut
+            metric_question_id = _unique(
+                [qid for qid, _, words in index if words.issuperset(subject)]
+            )
+        else:
+            # The metric alone (e.g. "NPS") names the question
+            compatible = {t.value for t in METRIC_TYPE_COMPATIBILITY[metric_type]}
+            metric_question_id = _unique(
+                [qid for qid, type_value, _ in index if type_value in compatible]
+            )
+        if metric_question_id is None:
+            return None
+
+        cut_id = "_".join(["cut", metric_type, *subject])
+        resolution_map = {" ".join(subject) or metric_type: metric_question_id}
+        dimensions = []
+        if len(parts) == 2:
+            dim_words = [w for w in _words(parts[1]) if w not in _FILLER_WORDS]
+            if not dim_words:
+                return None
+            candidates = [
+                DimensionSpec(kind="question", id=qid)
+                for qid, _, words in index
+                if words.issuperset(dim_words)
+            ]
+            candidates += [
+                DimensionSpec(kind="segment", id=s.segment_id)
+                for s in (ctx.segments or [])
+                if set(_words(f"{s.segment_id} {s.name}")).issuperset(dim_words)
+            ]
+            if len(candidates) != 1:
+                return None
+            dimensions = candidates
+            cut_id = "_".join([cut_id, "by", *dim_words])
+            resolution_map[" ".join(dim_words)] = candidates[0].id
+
+        cut = CutSpec(
+            cut_id=cut_id,
+            metric=MetricSpec(type=metric_type, question_id=metric_question_id),
+            dimensions=dimensions,
+        )
+        if validate_cut_spec(cut, ctx.questions_by_id, ctx.segments_by_id):
+            return None
+
+        return ToolOutput.success(
+            data=cut,
+            warnings=[ToolMessage(
+                code="resolution_mapped",
+                message=f"Mapped terms: {resolution_map}"
+            )],
+            trace={
+                "prompt": ctx.prompt,
+                "planner": "keyword",
+                "resolution_map": resolution_map,
+                "validation_passed": True
+            }
+        )
+
+    def _process_plan(
+        self,
+        ctx: ToolContext,
+        cut_plan: CutPlanResult,
+        llm_trace: Dict[str, Any],
+    ) -> ToolOutput[CutSpec]:
+        """Turn the LLM's plan for one request into a ToolOutput.
+
+        Traces keep the response models as-is; they are only dumped if the
+        trace is written to a run.
+        """
+        if not cut_plan.ok:
+            # Convert error dicts to ToolMessage objects
+            error_messages = []
+            for error_dict in cut_plan.errors:
+                error_messages.append(ToolMessage(
+                    code=error_dict.get("code", "llm_error"),
+                    message=error_dict.get("message", "Unknown LLM error"),
+                    context=error_dict.get("context", {})
+                ))
+            
+            return ToolOutput.failure(
+                errors=error_messages,
+                trace={
+                    "prompt": ctx.prompt,
+                    "llm_response": cut_plan,
+                    "llm_trace": llm_trace
+                }
+            )
+        
+        # Check if user resolution is needed
+        if cut_plan.requires_user_resolution and len(cut_plan.ambiguity_options) > 1:
+            # Sort by confidence
+            sorted_options = sorted(
+                cut_plan.ambiguity_options, 
+                key=attrgetter("confidence"), 
+                reverse=True
+            )
+            
+            # Prepare user input options (AmbiguityOption has the option fields)
+            user_options = [opt.model_dump() for opt in sorted_options]
+            
+            # Return partial result requiring user input
+            return ToolOutput.partial_for_user_input(
+                prompt=f"Your request '{ctx.prompt}' could mean multiple things. Which one do you mean?",
+                options=user_options,
+                trace={
+                    "prompt": ctx.prompt,
+                    "ambiguity_options": sorted_options,
+                    "resolution_map": cut_plan.resolution_map,
+                    "llm_trace": llm_trace
+                }
+            )
+        
+        # If no ambiguity or cut already generated, validate
+        if cut_plan.cut:
+            # Generate cut_id if missing; identical cuts get the same id
+            if not cut_plan.cut.cut_id:
+                spec_json = cut_plan.cut.model_dump_json(exclude={"cut_id"})
+                cut_plan.cut.cut_id = f"cut_{short_hash(spec_json)}"
+            
+            # Validate using the existing validate_cut_spec function
+            validation_errors = validate_cut_spec(
+                cut_plan.cut, 
+                ctx.questions_by_id, 
+                ctx.segments_by_id
+            )
+            
+            if validation_errors:
+                # Convert validation errors to ToolMessage format
+                tool_errors = []
+                for error_item in validation_errors:
+                    # Handle different error formats
+                    if isinstance(error_item, dict):
+                        tool_errors.append(ToolMessage(
+                            code=error_item.get("code", "validation_error"),
+                            message=error_item.get("message", "Validation failed"),
+                            context=error_item.get("context", {})
+                        ))
+                    elif isinstance(error_item, ToolMessage):
+                        tool_errors.append(error_item)
+                    else:
+                        # Fallback
+                        tool_errors.append(err("validation_error", str(error_item)))
+                
+                return ToolOutput.failure(
+                    errors=tool_errors,
+                    trace={
+                        "prompt": ctx.prompt,
+                        "validation_errors": validation_errors,
+                        "llm_trace": llm_trace
+                    }
+                )
+            
+            return ToolOutput.success(
+                data=cut_plan.cut,
+                warnings=[ToolMessage(
+                    code="resolution_mapped", 
+                    message=f"Mapped terms: {cut_plan.resolution_map}"
+                )] if cut_plan.resolution_map else [],
+                trace={
+                    "prompt": ctx.prompt,
+                    "resolution_map": cut_plan.resolution_map,
+                    "llm_response": cut_plan,
+                    "llm_trace": llm_trace,
+                    "validation_passed": True
+                }
+            )
+        else:
+            # No cut generated and no ambiguity? This shouldn't happen
+            return ToolOutput.failure(
+                errors=[err("no_cut_generated", "LLM did not generate a CutSpec")]
+            )
+
+    def _build_system_prompt(self, ctx: ToolContext) -> str:
+        """Build the system prompt to guide LLM reasoning."""
+        return _render_system_prompt(
+            catalog_key(ctx.questions), _segments_key(ctx.segments)
+        )
+
     def _build_user_content(self, ctx: ToolContext) -> str:
         """Build the user message content."""
         return f"""Analysis request: "{ctx.prompt}"
@@ -404,4 +652,26 @@ Remember:
 4. Map user terms to actual IDs in resolution_map
 5. Return ONLY valid JSON matching the CutPlanResult schema
 
+JSON Output:"""
+
+    def _build_batch_user_content(self, ctxs: List[ToolContext]) -> str:
+        """Build the user message content for a batch of requests."""
+        requests = "\n".join(
+            f'Request {i}: "{ctx.prompt}"' for i, ctx in enumerate(ctxs, start=1)
+        )
+        return f"""Analysis requests:
+{requests}
+
+Based on the available questions and segments shown in the system prompt, generate the appropriate CutSpec for EACH request independently.
+
+IMPORTANT: Check each request for ambiguity. If multiple questions could match a request, list them in that result's ambiguity_options with detailed match reasons.
+
+Remember:
+1. Return exactly {len(ctxs)} results, one CutPlanResult per request, in request order
+2. Check for ambiguity and list all possible matches if any
+3. Check metric compatibility with question type
+4. Generate a cut_id (system will finalize it if missing)
+5. Map user terms to actual IDs in resolution_map
+6. Return ONLY valid JSON of the form {{"results": [...]}}
+
 JSON Output:"""
\ No newline at end of file
@@ -1,13 +1,14 @@
 """High-level analysis planner tool."""
 
 import json
+from functools import lru_cache
 from typing import Any, Optional
 from pydantic import BaseModel, Field
 
 from dd_agent.contracts.specs import HighLevelPlan, AnalysisIntent, SegmentSpec
 from dd_agent.contracts.tool_output import ToolMessage, ToolOutput, err
 from dd_agent.llm.structured import build_messages, chat_structured_pydantic
-from dd_agent.tools.base import Tool, ToolContext
+from dd_agent.tools.base import CatalogKey, Tool, ToolContext, catalog_key
 
 
 class HighLevelPlanResult(BaseModel):
@@ -22,105 +23,37 @@ class HighLevelPlanResult(BaseModel):
     )
 
 
-class HighLevelPlanner(Tool):
-    """Tool for generating high-level analysis plans.
+@lru_cache(maxsize=8)
+def _render_system_prompt(catalog: CatalogKey, scope: Optional[str]) -> str:
+    """Render the high-level planner system prompt.
 
-    Given a question catalog and optional scope document, this tool
-    proposes a comprehensive set of analysis intents that would
-    provide valuable insights from the survey data.
-    """
+    Cached on the catalog and scope, so the prompt is built once per
+    dataset and is byte-identical across calls.
 
-    @property
-    def name(self) -> str:
-        return "high_level_planner"
+    Args:
+        catalog: Question catalog from catalog_key
+        scope: Optional project scope document
 
-    @property
-    def description(self) -> str:
-        return "Generates a high-level analysis plan with intents and suggested segments"
+    Returns:
+        System prompt text
+    """
+    # Build string representation of question catalog
+    questions_info = []
+    for question_id, label, type_value, options in catalog:
+        question_desc = f"- ID: {question_id}, Label: '{label}', Type: {type_value}"
+        if options:
+            options_str = ", ".join(f"'{code}': '{opt_label}'" for code, opt_label in options)
+            question_desc += f", Options: {{{options_str}}}"
+        questions_info.append(question_desc)
 
-    def run(self, ctx: ToolContext) -> ToolOutput[HighLevelPlan]:
-        """Execute the high-level planning tool.
+    questions_str = "\n".join(questions_info)
 
-        Args:
-            ctx: Tool context with questions and optional scope
+    # Add scope if available
+    scope_str = ""
+    if scope:
+        scope_str = f"\n\n# Project Scope\n{scope[:2000]}..."  # Limit scope length
 
-        Returns:
-            ToolOutput containing a HighLevelPlan or errors
-        """
-        try:
-            # 1. Prepare context information
-            user_content = self._build_user_content(ctx)
-            
-            # 2. Build system prompt
-            system_prompt = self._build_system_prompt(ctx)
-            
-            # 3. Call LLM to generate structured output
-            messages = build_messages(
-                system_prompt=system_prompt,
-                user_content=user_content
-            )
-            
-            # 4. Get LLM response
-            plan_result, llm_trace = chat_structured_pydantic(
-                messages=messages,
-                model=HighLevelPlanResult,
-                temperature=0.3  # Slightly higher for creative planning
-            )
-            
-            # 5. Process LLM response
-            if not plan_result.ok:
-                return ToolOutput.failure(
-                    errors=[err("llm_failed", f"LLM failed to produce valid plan: {plan_result.errors}")]
-                )
-            
-            # 6. Validate the generated plan
-            if plan_result.plan:
-                validation_errors = self._validate_plan(plan_result.plan, ctx)
-                
-                if validation_errors:
-                    return ToolOutput.failure(
-                        errors=validation_errors
-                    )
-                
-                return ToolOutput.success(
-                    data=plan_result.plan,
-                    trace={
-                        "llm_response": plan_result.model_dump(),
-                        "llm_trace": llm_trace,
-                        "validation_passed": True
-                    }
-                )
-            else:
-                return ToolOutput.failure(
-                    errors=[err("no_plan_generated", "LLM did not generate a plan")]
-                )
-                
-        except Exception as e:
-            return ToolOutput.failure(
-                errors=[err("unexpected_error", f"Unexpected error: {str(e)}")]
-            )
-
-    def _build_system_prompt(self, ctx: ToolContext) -> str:
-        """Build the system prompt to guide LLM reasoning."""
-        
-        # Build string representation of question catalog
-        questions_info = []
-        for q in ctx.questions:
-            question_desc = f"- ID: {q.question_id}, Label: '{q.label}', Type: {q.type.value}"
-            if q.options:
-                option_strings = [f"'{opt.code}': '{opt.label}'" for opt in q.options]
-                options_str = ", ".join(option_strings)
-                question_desc += f", Options: {{{options_str}}}"
-            questions_info.append(question_desc)
-        
-        questions_str = "\n".join(questions_info)
-        
-        # Add scope if available
-        scope_str = ""
-        if ctx.scope:
-            scope_str = f"\n\n# Project Scope\n{ctx.scope[:2000]}..."  # Limit scope length
-        
-        return f"""You are a senior data analyst responsible for creating comprehensive analysis plans for survey data.
+    return f"""You are a senior data analyst responsible for creating comprehensive analysis plans for survey data.
 
 # Available Data
 Here are the questions in the dataset:
@@ -211,6 +144,89 @@ Return a HighLevelPlanResult object with this EXACT structure:
 
 Now create an analysis plan for this dataset."""
 
+
+class HighLevelPlanner(Tool):
+    """Tool for generating high-level analysis plans.
+
+    Given a question catalog and optional scope document, this tool
+    proposes a comprehensive set of analysis intents that would
+    provide valuable insights from the survey data.
+    """
+
+    @property
+    def name(self) -> str:
+        return "high_level_planner"
+
+    @property
+    def description(self) -> str:
+        return "Generates a high-level analysis plan with intents and suggested segments"
+
+    def run(self, ctx: ToolContext) -> ToolOutput[HighLevelPlan]:
+        """Execute the high-level planning tool.
+
+        Args:
+            ctx: Tool context with questions and optional scope
+
+        Returns:
+            ToolOutput containing a HighLevelPlan or errors
+        """
+        try:
+            # 1. Prepare context information
+            user_content = self._build_user_content(ctx)
+            
+            # 2. Build system prompt
+            system_prompt = self._build_system_prompt(ctx)
+            
+            # 3. Call LLM to generate structured output
+            messages = build_messages(
+                system_prompt=system_prompt,
+                user_content=user_content
+            )
+            
+            # 4. Get LLM response
+            plan_result, llm_trace = chat_structured_pydantic(
+                messages=messages,
+                model=HighLevelPlanResult,
+                temperature=0.3  # Slightly higher for creative planning
+            )
+            
+            # 5. Process LLM response
+            if not plan_result.ok:
+                return ToolOutput.failure(
+                    errors=[err("llm_failed", f"LLM failed to produce valid plan: {plan_result.errors}")]
+                )
+            
+            # 6. Validate the generated plan
+            if plan_result.plan:
+                validation_errors = self._validate_plan(plan_result.plan, ctx)
+                
+                if validation_errors:
+                    return ToolOutput.failure(
+                        errors=[err("invalid_plan", message) for message in validation_errors]
+                    )
+                
+                return ToolOutput.success(
+                    data=plan_result.plan,
+                    trace={
+                        "llm_response": plan_result,
+                        "llm_trace": llm_trace,
+                        "validation_passed": True
+                    }
+                )
+            else:
+                return ToolOutput.failure(
+                    errors=[err("no_plan_generated", "LLM did not generate a plan")]
+                )
+                
+        except Exception as e:
+            return ToolOutput.failure(
+                errors=[err("unexpected_error", f"Unexpected error: {str(e)}")]
+            )
+
+    def _build_system_prompt(self, ctx: ToolContext) -> str:
+        """Build the system prompt to guide LLM reasoning."""
+        return _render_system_prompt(catalog_key(ctx.questions), ctx.scope)
+
     def _build_user_content(self, ctx: ToolContext) -> str:
         """Build the user message content."""
         return """Based on the available questions shown above, generate a comprehensive analysis plan.
@@ -229,7 +245,7 @@ JSON Output:"""
     ) -> list[Any]:
         """Validate the generated plan."""
         errors = []
-        questions_by_id = {q.question_id: q for q in ctx.questions}
+        questions_by_id = ctx.questions_by_id
         
         # Check that all intents have required fields
         for i, intent in enumerate(plan.intents):
@@ -2,6 +2,7 @@
 
 import json
 import uuid
+from functools import lru_cache
 from typing import Any, Optional
 from pydantic import BaseModel, Field
 
@@ -10,7 +11,7 @@ from dd_agent.contracts.specs import SegmentSpec
 from dd_agent.contracts.tool_output import ToolMessage, ToolOutput, err, warn
 from dd_agent.contracts.validate import validate_segment_spec
 from dd_agent.llm.structured import build_messages, chat_structured_pydantic
-from dd_agent.tools.base import Tool, ToolContext
+from dd_agent.tools.base import CatalogKey, Tool, ToolContext, catalog_key
 
 
 class SegmentPlanResult(BaseModel):
@@ -33,6 +34,150 @@ class SegmentPlanResult(BaseModel):
     )
 
 
+@lru_cache(maxsize=8)
+def _render_system_prompt(catalog: CatalogKey) -> str:
+    """Render the segment builder system prompt.
+
+    Cached on the catalog, so the prompt is built once per dataset.
+
+    Args:
+        catalog: Question catalog from catalog_key
+
+    Returns:
+        System prompt text
+    """
+    # Build string representation of question catalog
+    questions_info = []
+    for question_id, label, type_value, options in catalog:
+        question_desc = f"- ID: {question_id}, Label: '{label}', Type: {type_value}"
+        if options:
+            options_str = ", ".join(f"'{code}': '{opt_label}'" for code, opt_label in options)
+            question_desc += f", Options: {{{options_str}}}"
+        questions_info.append(question_desc)
+
+    questions_str = "\n".join(questions_info)
+
+    return f"""You are a data analysis expert responsible for converting natural language segment definitions into precise SegmentSpec specifications.
+
+# Available Data
+Here are the questions in the dataset:
+{questions_str}
+
+# Task
+Parse the user's natural language segment definition into a SegmentSpec containing:
+1. segment_id: Unique identifier (you can suggest, system will finalize)
+2. name: Human-readable segment name
+3. definition: A filter expression (FilterExpr) that defines the segment
+4. intended_partition: Whether this is meant to partition the data (true/false)
+5. notes: Optional notes about the segment
+
+# Important Rules
+## 1. Filter Expression Types
+You can create these filter types:
+- PredicateEq(question_id="Q_ID", value="option_code") - For exact matches
+- PredicateIn(question_id="Q_ID", values=["code1", "code2"]) - For multiple values
+- PredicateRange(question_id="Q_ID", min=X, max=Y) - For numeric ranges
+- PredicateContainsAny(question_id="Q_ID", values=["code1", "code2"]) - For multi-choice
+- And(children=[expr1, expr2]) - Logical AND
+- Or(children=[expr1, expr2]) - Logical OR
+- Not(child=expr) - Logical NOT
+
+## 2. Question Type Compatibility
+- Use PredicateEq/PredicateIn for single_choice questions
+- Use PredicateContainsAny for multi_choice questions  
+- Use PredicateRange for numeric/nps/likert questions
+- Ensure values match question option codes exactly (as strings if codes are numeric)
+
+## 3. Output Format
+You must return a SegmentPlanResult object with this exact structure:
+{{
+    "ok": true,
+    "segment": {{
+        "segment_id": "suggested_segment_name",
+        "name": "Human Readable Name",
+        "definition": {{"kind": "eq", "question_id": "Q_ID", "value": "option_code"}},
+        "intended_partition": false,
+        "notes": "Optional notes"
+    }},
+    "resolution_map": {{"user_term": "actual_id_or_value"}},
+    "ambiguity_options": [],
+    "errors": []
+}}
+
+# Critical Instructions
+1. Suggest a segment_id based on the definition (e.g., "young_users", "high_income")
+2. Create a clear, descriptive name
+3. Ensure the filter expression uses valid question IDs and values
+4. Map user terms to actual IDs/values in resolution_map
+5. If unsure about which question to use, add options to ambiguity_options
+6. Return ONLY valid JSON, no other text
+
+# Examples
+Example 1:
+User: "Young users aged 18-30"
+Available: Q_AGE (numeric)
+Response: {{
+    "ok": true,
+    "segment": {{
+        "segment_id": "young_users",
+        "name": "Young Users (18-30)",
+        "definition": {{"kind": "range", "question_id": "Q_AGE", "min": 18, "max": 30, "inclusive": true}},
+        "intended_partition": false,
+        "notes": "Users between 18 and 30 years old"
+    }},
+    "resolution_map": {{"young": "18-30", "users": "Q_AGE"}},
+    "ambiguity_options": [],
+    "errors": []
+}}
+
+Example 2:
+User: "High income professionals from North or South regions"
+Available: Q_INCOME (single_choice), Q_REGION (single_choice)
+Options for Q_INCOME: 'LOW', 'MED', 'HIGH', 'VHIGH'
+Options for Q_REGION: 'NORTH', 'SOUTH', 'EAST', 'WEST'
+Response: {{
+    "ok": true,
+    "segment": {{
+        "segment_id": "high_income_north_south",
+        "name": "High Income from North/South Regions",
+        "definition": {{
+            "kind": "and",
+            "children": [
+                {{"kind": "in", "question_id": "Q_INCOME", "values": ["HIGH", "VHIGH"]}},
+                {{"kind": "or", "children": [
+                    {{"kind": "eq", "question_id": "Q_REGION", "value": "NORTH"}},
+                    {{"kind": "eq", "question_id": "Q_REGION", "value": "SOUTH"}}
+                ]}}
+            ]
+        }},
+        "intended_partition": false,
+        "notes": "High income users from northern or southern regions"
+    }},
+    "resolution_map": {{"high income": "HIGH/VHIGH", "professionals": "Q_INCOME", "north": "NORTH", "south": "SOUTH"}},
+    "ambiguity_options": [],
+    "errors": []
+}}
+
+Example 3:
+User: "Promoters (NPS 9-10)"
+Available: Q_NPS (nps_0_10)
+Response: {{
+    "ok": true,
+    "segment": {{
+        "segment_id": "promoters",
+        "name": "Promoters (NPS 9-10)",
+        "definition": {{"kind": "range", "question_id": "Q_NPS", "min": 9, "max": 10, "inclusive": true}},
+        "intended_partition": true,
+        "notes": "Users who gave NPS scores of 9 or 10"
+    }},
+    "resolution_map": {{"promoters": "9-10", "nps": "Q_NPS"}},
+    "ambiguity_options": [],
+    "errors": []
+}}
+
+Now process the user request below."""
+
+
 class SegmentBuilder(Tool):
     """Tool for converting natural language segment definitions to SegmentSpecs.
 
@@ -88,8 +233,7 @@ class SegmentBuilder(Tool):
             if isinstance(llm_result, SegmentSpec):
                 # Test mock case - validate the SegmentSpec directly
                 segment_spec = llm_result
-                questions_by_id = {q.question_id: q for q in ctx.questions}
-                validation_errors = validate_segment_spec(segment_spec, questions_by_id)
+                validation_errors = validate_segment_spec(segment_spec, ctx.questions_by_id)
                 
                 if validation_errors:
                     # Convert validation errors to ToolMessage format
@@ -136,7 +280,7 @@ class SegmentBuilder(Tool):
                     errors=error_messages,
                     trace={
                         "prompt": ctx.prompt,
-                        "llm_response": segment_plan.model_dump(),
+                        "llm_response": segment_plan,
                         "llm_trace": llm_trace
                     }
                 )
@@ -161,10 +305,9 @@ class SegmentBuilder(Tool):
                     segment_plan.segment.segment_id = f"segment_{uuid.uuid4().hex[:8]}"
                 
                 # Validate using the existing validate_segment_spec function
-                questions_by_id = {q.question_id: q for q in ctx.questions}
                 validation_errors = validate_segment_spec(
                     segment_plan.segment, 
-                    questions_by_id
+                    ctx.questions_by_id
                 )
                 
                 if validation_errors:
@@ -200,7 +343,7 @@ class SegmentBuilder(Tool):
                     trace={
                         "prompt": ctx.prompt,
                         "resolution_map": segment_plan.resolution_map,
-                        "llm_response": segment_plan.model_dump(),
+                        "llm_response": segment_plan,
                         "llm_trace": llm_trace,
                         "validation_passed": True
                     }
@@ -217,142 +360,7 @@ class SegmentBuilder(Tool):
 
     def _build_system_prompt(self, ctx: ToolContext) -> str:
         """Build the system prompt to guide LLM reasoning."""
-        
-        # Build string representation of question catalog
-        questions_info = []
-        for q in ctx.questions:
-            question_desc = f"- ID: {q.question_id}, Label: '{q.label}', Type: {q.type.value}"
-            if q.options:
-                # Handle numeric option codes
-                option_strings = []
-                for opt in q.options:
-                    # Ensure we show both code and label properly
-                    option_strings.append(f"'{opt.code}': '{opt.label}'")
-                options_str = ", ".join(option_strings)
-                question_desc += f", Options: {{{options_str}}}"
-            questions_info.append(question_desc)
-        
-        questions_str = "\n".join(questions_info)
-        
-        return f"""You are a data analysis expert responsible for converting natural language segment definitions into precise SegmentSpec specifications.
-
-# Available Data
-Here are the questions in the dataset:
-{questions_str}
-
-# Task
-Parse the user's natural language segment definition into a SegmentSpec containing:
-1. segment_id: Unique identifier (you can suggest, system will finalize)
-2. name: Human-readable segment name
-3. definition: A filter expression (FilterExpr) that defines the segment
-4. intended_partition: Whether this is meant to partition the data (true/false)
-5. notes: Optional notes about the segment
-
-# Important Rules
-## 1. Filter Expression Types
-You can create these filter types:
-- PredicateEq(question_id="Q_ID", value="option_code") - For exact matches
-- PredicateIn(question_id="Q_ID", values=["code1", "code2"]) - For multiple values
-- PredicateRange(question_id="Q_ID", min=X, max=Y) - For numeric ranges
-- PredicateContainsAny(question_id="Q_ID", values=["code1", "code2"]) - For multi-choice
-- And(children=[expr1, expr2]) - Logical AND
-- Or(children=[expr1, expr2]) - Logical OR
-- Not(child=expr) - Logical NOT
-
-## 2. Question Type Compatibility
-- Use PredicateEq/PredicateIn for single_choice questions
-- Use PredicateContainsAny for multi_choice questions  
-- Use PredicateRange for numeric/nps/likert questions
-- Ensure values match question option codes exactly (as strings if codes are numeric)
-
-## 3. Output Format
-You must return a SegmentPlanResult object with this exact structure:
-{{
-    "ok": true,
-    "segment": {{
-        "segment_id": "suggested_segment_name",
-        "name": "Human Readable Name",
-        "definition": {{"kind": "eq", "question_id": "Q_ID", "value": "option_code"}},
-        "intended_partition": false,
-        "notes": "Optional notes"
-    }},
-    "resolution_map": {{"user_term": "actual_id_or_value"}},
-    "ambiguity_options": [],
-    "errors": []
-}}
-
-# Critical Instructions
-1. Suggest a segment_id based on the definition (e.g., "young_users", "high_income")
-2. Create a clear, descriptive name
-3. Ensure the filter expression uses valid question IDs and values
-4. Map user terms to actual IDs/values in resolution_map
-5. If unsure about which question to use, add options to ambiguity_options
-6. Return ONLY valid JSON, no other text
-
-# Examples
-Example 1:
-User: "Young users aged 18-30"
-Available: Q_AGE (numeric)
-Response: {{
-    "ok": true,
-    "segment": {{
-        "segment_id": "young_users",
-        "name": "Young Users (18-30)",
-        "definition": {{"kind": "range", "question_id": "Q_AGE", "min": 18, "max": 30, "inclusive": true}},
-        "intended_partition": false,
-        "notes": "Users between 18 and 30 years old"
-    }},
-    "resolution_map": {{"young": "18-30", "users": "Q_AGE"}},
-    "ambiguity_options": [],
-    "errors": []
-}}
-
-Example 2:
-User: "High income professionals from North or South regions"
-Available: Q_INCOME (single_choice), Q_REGION (single_choice)
-Options for Q_INCOME: 'LOW', 'MED', 'HIGH', 'VHIGH'
-Options for Q_REGION: 'NORTH', 'SOUTH', 'EAST', 'WEST'
-Response: {{
-    "ok": true,
-    "segment": {{
-        "segment_id": "high_income_north_south",
-        "name": "High Income from North/South Regions",
-        "definition": {{
-            "kind": "and",
-            "children": [
-                {{"kind": "in", "question_id": "Q_INCOME", "values": ["HIGH", "VHIGH"]}},
-                {{"kind": "or", "children": [
-                    {{"kind": "eq", "question_id": "Q_REGION", "value": "NORTH"}},
-                    {{"kind": "eq", "question_id": "Q_REGION", "value": "SOUTH"}}
-                ]}}
-            ]
-        }},
-        "intended_partition": false,
-        "notes": "High income users from northern or southern regions"
-    }},
-    "resolution_map": {{"high income": "HIGH/VHIGH", "professionals": "Q_INCOME", "north": "NORTH", "south": "SOUTH"}},
-    "ambiguity_options": [],
-    "errors": []
-}}
-
-Example 3:
-User: "Promoters (NPS 9-10)"
-Available: Q_NPS (nps_0_10)
-Response: {{
-    "ok": true,
-    "segment": {{
-        "segment_id": "promoters",
-        "name": "Promoters (NPS 9-10)",
-        "definition": {{"kind": "range", "question_id": "Q_NPS", "min": 9, "max": 10, "inclusive": true}},
-        "intended_partition": true,
-        "notes": "Users who gave NPS scores of 9 or 10"
-    }},
-    "resolution_map": {{"promoters": "9-10", "nps": "Q_NPS"}},
-    "ambiguity_options": [],
-    "errors": []
-}}
-
-Now process the user request below."""
+        return _render_system_prompt(catalog_key(ctx.questions))
 
     def _build_user_content(self, ctx: ToolContext) -> str:
         """Build the user message content."""
@@ -1,17 +1,31 @@
 """Dataset hashing utilities for reproducibility."""
 
 import hashlib
+import json
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
+from uuid import uuid4
+
+
+# Read size for streaming file contents into a hash
+_CHUNK_SIZE = 1 << 20
+
+# Number of digests kept per on-disk digest cache
+_HASH_CACHE_MAX_ENTRIES = 32
+
+
+def _update_from_file(sha256: Any, path: Path) -> None:
+    """Stream a file's contents into a hash object."""
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            sha256.update(chunk)
 
 
 def hash_file(path: Path) -> str:
     """Compute SHA-256 hash of a file."""
-    sha256 = hashlib.sha256()
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 
 def hash_dataset(
@@ -35,21 +49,101 @@ def hash_dataset(
     sha256 = hashlib.sha256()
 
     # Hash questions file
-    with open(questions_path, "rb") as f:
-        sha256.update(f.read())
+    _update_from_file(sha256, questions_path)
 
     # Hash responses file
-    with open(responses_path, "rb") as f:
-        sha256.update(f.read())
+    _update_from_file(sha256, responses_path)
 
     # Hash scope file if provided
     if scope_path and scope_path.exists():
-        with open(scope_path, "rb") as f:
-            sha256.update(f.read())
+        _update_from_file(sha256, scope_path)
 
     return sha256.hexdigest()
 
 
+def _stat_key(paths: list[Path]) -> str:
+    """Identify file versions by resolved path, size and modification time."""
+    parts = []
+    for path in paths:
+        stat = path.stat()
+        parts.append(f"{Path(path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def _cached_digest(cache_path: Path, key: str, compute: Callable[[], str]) -> str:
+    """Get a digest from a JSON cache file, computing and storing it on a miss."""
+    cache_path = Path(cache_path)
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    if key in cache:
+        return cache[key]
+
+    digest = compute()
+
+    # Newest entries last; write to a temp file, then atomically move into place
+    cache[key] = digest
+    cache = dict(list(cache.items())[-_HASH_CACHE_MAX_ENTRIES:])
+    tmp_path = cache_path.with_name(f".{cache_path.name}.{uuid4().hex}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(cache, indent=2))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+    return digest
+
+
+def hash_file_cached(cache_path: Path, path: Path) -> str:
+    """Compute hash_file, reusing a digest stored on disk.
+
+    Args:
+        cache_path: JSON file holding previously computed digests
+        path: File to hash
+
+    Returns:
+        SHA-256 hash of the file
+    """
+    return _cached_digest(cache_path, _stat_key([path]), lambda: hash_file(path))
+
+
+def hash_dataset_cached(
+    cache_path: Path,
+    questions_path: Path,
+    responses_path: Path,
+    scope_path: Optional[Path] = None,
+) -> str:
+    """Compute hash_dataset, reusing a digest stored on disk.
+
+    Digests are keyed by each file's path, size and modification time, so
+    unchanged files are not re-read.
+
+    Args:
+        cache_path: JSON file holding previously computed digests
+        questions_path: Path to questions.json
+        responses_path: Path to responses.csv
+        scope_path: Optional path to scope.md
+
+    Returns:
+        SHA-256 hash of the combined file contents
+    """
+    paths = [questions_path, responses_path]
+    if scope_path and scope_path.exists():
+        paths.append(scope_path)
+    return _cached_digest(
+        cache_path,
+        _stat_key(paths),
+        lambda: hash_dataset(questions_path, responses_path, scope_path),
+    )
+
+
 def hash_string(content: str) -> str:
     """Compute SHA-256 hash of a string."""
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def short_hash(content: str, digest_size: int = 4) -> str:
+    """Compute a short BLAKE2b hex digest of a string, for stable IDs."""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=digest_size).hexdigest()
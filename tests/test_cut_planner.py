@@ -60,12 +60,8 @@ def test_cut_planner_with_nps_request():
         # Create CutPlanner
         planner = CutPlanner()
         
-        # Create a mock ToolContext object with all required attributes
-        ctx = MagicMock()
-        ctx.prompt = "Show NPS by region"
-        ctx.questions = questions
-        ctx.segments = []
-        ctx.llm_client = MagicMock()  # This won't be used due to mock
+        # Create a ToolContext (it builds the ID lookups used for validation)
+        ctx = ToolContext(questions=questions, prompt="Show NPS by region")
         
         # Run the planner
         result = planner.run(ctx)
@@ -148,6 +144,80 @@ def test_cut_planner_basic():
     assert "data analysis expert" in system_prompt
     assert "test" in user_content
 
+def test_system_prompt_reused_for_same_catalog():
+    """Test the system prompt is rendered once per question catalog."""
+    planner = CutPlanner()
+    questions = [
+        Question(question_id="Q_NPS", label="Recommend?", type=QuestionType.nps_0_10)
+    ]
+
+    first = planner._build_system_prompt(ToolContext(questions=questions, prompt="a"))
+    second = planner._build_system_prompt(ToolContext(questions=list(questions), prompt="b"))
+    renamed = [
+        Question(question_id="Q_NPS", label="Likely to recommend?", type=QuestionType.nps_0_10)
+    ]
+    other = planner._build_system_prompt(ToolContext(questions=renamed, prompt="a"))
+
+    assert first is second
+    assert other is not first
+    assert "Likely to recommend?" in other
+
+def test_keyword_planner_skips_llm_for_simple_request():
+    """Test a simple request is planned without calling the LLM."""
+    from dd_agent.config import settings
+
+    questions = [
+        Question(question_id="Q_NPS", label="How likely are you to recommend us?", type=QuestionType.nps_0_10),
+        Question(question_id="Q_REGION", label="Which region are you from?", type=QuestionType.single_choice),
+    ]
+    ctx = ToolContext(questions=questions, prompt="Show NPS by region")
+
+    with patch.object(settings, "DD_KEYWORD_PLANNER", True), \
+            patch('dd_agent.tools.cut_planner.chat_structured_pydantic') as mock_llm:
+        result = CutPlanner().run(ctx)
+
+    mock_llm.assert_not_called()
+    assert result.ok
+    assert result.trace["planner"] == "keyword"
+    assert result.data.metric.type == "nps"
+    assert result.data.metric.question_id == "Q_NPS"
+    assert [d.id for d in result.data.dimensions] == ["Q_REGION"]
+
+
+def test_keyword_planner_leaves_ambiguous_request_to_llm():
+    """Test a request matching several questions still goes to the LLM."""
+    from dd_agent.config import settings
+
+    questions = [
+        Question(question_id="Q_OVERALL_SAT", label="How satisfied are you overall?", type=QuestionType.likert_1_5),
+        Question(question_id="Q_SUPPORT_SAT", label="How satisfied are you with support?", type=QuestionType.likert_1_5),
+        Question(question_id="Q_REGION", label="Which region are you from?", type=QuestionType.single_choice),
+    ]
+    ctx = ToolContext(questions=questions, prompt="Top 2 box satisfied by region")
+
+    with patch.object(settings, "DD_KEYWORD_PLANNER", True):
+        assert CutPlanner()._try_deterministic_plan(ctx) is None
+
+
+def test_missing_cut_id_is_derived_from_spec():
+    """Test identical cuts without an id get the same deterministic cut_id."""
+    questions = [
+        Question(question_id="Q_NPS", label="How likely are you to recommend us?", type=QuestionType.nps_0_10),
+    ]
+    ctx = ToolContext(questions=questions, prompt="NPS overall")
+
+    def plan_without_id():
+        cut = CutSpec(cut_id="", metric=MetricSpec(type="nps", question_id="Q_NPS"))
+        return CutPlanResult(ok=True, cut=cut)
+
+    planner = CutPlanner()
+    first = planner._process_plan(ctx, plan_without_id(), {})
+    second = planner._process_plan(ctx, plan_without_id(), {})
+
+    assert first.ok and second.ok
+    assert first.data.cut_id.startswith("cut_")
+    assert first.data.cut_id == second.data.cut_id
+
 # Add this test to run the dimension spec check
 if __name__ == "__main__":
     # Run the dimension spec test
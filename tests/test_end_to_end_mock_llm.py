@@ -1,5 +1,6 @@
 """End-to-end tests with mock LLM backend."""
 
+import asyncio
 import json
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -104,6 +105,30 @@ class TestExecutorEndToEnd:
         table = result.tables[0]
         assert "by_dimension" in table.result_data
 
+    def test_filtered_dimension_crosstab(self, sample_questions, sample_responses_df):
+        """Test cached dimension codes are restricted to the filtered rows."""
+        questions_by_id = {q.question_id: q for q in sample_questions}
+
+        executor = Executor(
+            df=sample_responses_df,
+            questions_by_id=questions_by_id,
+        )
+
+        cut = CutSpec(
+            cut_id="test_filtered_crosstab",
+            metric=MetricSpec(type="mean", question_id="Q_SATISFACTION"),
+            dimensions=[{"kind": "question", "id": "Q_REGION"}],
+            filter=PredicateRange(question_id="Q_AGE", min=30, max=50),
+        )
+
+        result = executor.execute_cuts([cut])
+
+        filtered = sample_responses_df[sample_responses_df["Q_AGE"].between(30, 50)]
+        expected = filtered.groupby("Q_REGION", sort=False)["Q_SATISFACTION"].count()
+        base_sizes = result.tables[0].result_data["base_sizes"]
+        assert list(base_sizes) == [str(k) for k in expected.index]
+        assert list(base_sizes.values()) == expected.tolist()
+
     def test_multiple_cuts(self, sample_questions, sample_responses_df):
         """Test executing multiple cuts."""
         questions_by_id = {q.question_id: q for q in sample_questions}
@@ -133,6 +158,30 @@ class TestExecutorEndToEnd:
         assert len(result.tables) == 3
         assert {t.cut_id for t in result.tables} == {"cut1", "cut2", "cut3"}
 
+    def test_shared_filter_mask_reused(self, sample_questions, sample_responses_df):
+        """Cuts sharing a filter should build its mask once."""
+        questions_by_id = {q.question_id: q for q in sample_questions}
+
+        executor = Executor(
+            df=sample_responses_df,
+            questions_by_id=questions_by_id,
+        )
+
+        cuts = [
+            CutSpec(
+                cut_id=f"cut{i}",
+                metric=MetricSpec(type="nps", question_id="Q_NPS"),
+                filter=PredicateRange(question_id="Q_AGE", min=30, max=50),
+            )
+            for i in range(3)
+        ]
+
+        result = executor.execute_cuts(cuts)
+
+        assert len(result.tables) == 3
+        assert len(executor._filter_mask_cache) == 1
+        assert len({t.base_n for t in result.tables}) == 1
+
 
 class TestToolContextBuilding:
     """Tests for ToolContext construction."""
@@ -195,6 +244,67 @@ class TestMockLLMIntegration:
             assert result.data.cut_id == "mock_cut"
             assert result.data.metric.type == "nps"
 
+    def test_cut_planner_batch_with_mock(self, sample_questions):
+        """Test batched planning makes one LLM call and keeps request order."""
+        from dd_agent.tools.cut_planner import BatchedCutPlanResult, CutPlanner, CutPlanResult
+
+        def planned(cut_id, question_id):
+            return CutPlanResult(
+                ok=True,
+                cut=CutSpec(cut_id=cut_id, metric=MetricSpec(type="mean", question_id=question_id)),
+            )
+
+        batch = BatchedCutPlanResult(results=[planned("nps", "Q_NPS"), planned("sat", "Q_SATISFACTION")])
+        ctx = ToolContext(questions=sample_questions)
+        ctxs = [ctx.with_prompt("Mean NPS"), ctx.with_prompt("Mean satisfaction")]
+
+        with patch("dd_agent.tools.cut_planner.chat_structured_pydantic") as mock_llm:
+            mock_llm.return_value = (batch, {"model": "mock"})
+            results = CutPlanner().run_batch(ctxs)
+
+        assert mock_llm.call_count == 1
+        assert [r.data.cut_id for r in results] == ["nps", "sat"]
+
+    def test_cut_planner_batch_falls_back_on_short_response(self, sample_questions):
+        """Test a batch response missing results is replanned per request."""
+        from dd_agent.tools.cut_planner import BatchedCutPlanResult, CutPlanner, CutPlanResult
+
+        single = CutPlanResult(
+            ok=True,
+            cut=CutSpec(cut_id="single", metric=MetricSpec(type="nps", question_id="Q_NPS")),
+        )
+        ctx = ToolContext(questions=sample_questions)
+        ctxs = [ctx.with_prompt("NPS"), ctx.with_prompt("NPS again")]
+
+        with patch("dd_agent.tools.cut_planner.chat_structured_pydantic") as mock_llm:
+            mock_llm.side_effect = [
+                (BatchedCutPlanResult(results=[single]), {"model": "mock"}),
+                (single, {"model": "mock"}),
+                (single, {"model": "mock"}),
+            ]
+            results = CutPlanner().run_batch(ctxs)
+
+        assert mock_llm.call_count == 3
+        assert all(r.ok for r in results)
+
+    def test_cut_planner_run_many_with_mock(self, sample_questions):
+        """Test concurrent planning returns results in context order."""
+        from dd_agent.tools.cut_planner import CutPlanner, CutPlanResult
+
+        def fake_llm(messages, model, **kwargs):
+            prompt = messages[-1]["content"]
+            question_id = "Q_NPS" if "NPS" in prompt else "Q_SATISFACTION"
+            cut = CutSpec(cut_id=question_id, metric=MetricSpec(type="mean", question_id=question_id))
+            return CutPlanResult(ok=True, cut=cut), {"model": "mock"}
+
+        ctx = ToolContext(questions=sample_questions)
+        ctxs = [ctx.with_prompt(p) for p in ["Mean NPS", "Mean satisfaction", "NPS again"]]
+
+        with patch("dd_agent.tools.cut_planner.chat_structured_pydantic", side_effect=fake_llm):
+            results = asyncio.run(CutPlanner().run_many(ctxs, max_concurrency=2))
+
+        assert [r.data.cut_id for r in results] == ["Q_NPS", "Q_SATISFACTION", "Q_NPS"]
+
     def test_segment_builder_with_mock(self, sample_questions):
         """Test segment builder with mocked LLM response."""
         from dd_agent.tools.segment_builder import SegmentBuilder
@@ -220,6 +330,64 @@ class TestMockLLMIntegration:
             assert result.ok
             assert result.data.segment_id == "young_users"
 
+    def test_plan_cuts_async_with_mock(self, demo_data_dir, tmp_path):
+        """Test concurrent planning keeps prompt order and reports failures."""
+        from dd_agent.contracts.tool_output import ToolOutput
+        from dd_agent.orchestrator.pipeline import Pipeline
+
+        def fake_plan_cut(prompt):
+            if prompt == "bad":
+                raise RuntimeError("LLM unavailable")
+            return ToolOutput.success(
+                data=CutSpec(cut_id=prompt, metric=MetricSpec(type="nps", question_id="Q_NPS"))
+            )
+
+        pipeline = Pipeline(demo_data_dir, runs_dir=tmp_path / "runs")
+        with patch.object(pipeline, "_plan_cut", side_effect=fake_plan_cut):
+            results = asyncio.run(pipeline.plan_cuts_async(["a", "bad", "b"]))
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[0].data.cut_id == "a"
+        assert results[2].data.cut_id == "b"
+        assert results[1].errors[0].message == "LLM unavailable"
+
+    def test_plan_cuts_batches_cache_misses(self, demo_data_dir, tmp_path):
+        """Test batched planning only sends prompts without a cached plan."""
+        from dd_agent.config import settings
+        from dd_agent.contracts.tool_output import ToolOutput, warn
+        from dd_agent.orchestrator.agent import Agent
+        from dd_agent.orchestrator.pipeline import Pipeline
+        from dd_agent.plan_cache import plan_fingerprint
+
+        def fake_plan_cuts(self, prompts):
+            return [
+                ToolOutput.success(data=CutSpec(cut_id=p, metric=MetricSpec(type="nps", question_id="Q_NPS")))
+                for p in prompts
+            ]
+
+        pipeline = Pipeline(demo_data_dir, runs_dir=tmp_path / "runs")
+        cached = ToolOutput.success(
+            data=CutSpec(cut_id="cached", metric=MetricSpec(type="nps", question_id="Q_NPS")),
+            warnings=[warn("resolution_mapped", "Mapped terms: {'nps': 'Q_NPS'}")],
+        )
+        pipeline._store_cut_plan(plan_fingerprint("b", pipeline.dataset_hash), cached)
+
+        with patch.object(settings, "DD_PLAN_CACHE", True), \
+                patch.object(Agent, "plan_cuts", autospec=True, side_effect=fake_plan_cuts) as mock_plan:
+            results = pipeline._plan_cuts(["a", "b", "c"])
+
+        assert mock_plan.call_args.args[1] == ["a", "c"]
+        assert [r.data.cut_id for r in results] == ["a", "cached", "c"]
+        assert [w.code for w in results[1].warnings] == ["resolution_mapped"]
+        assert pipeline.plan_cache.get(plan_fingerprint("c", pipeline.dataset_hash)) is not None
+
+        # Without DD_PLAN_CACHE every prompt is planned
+        with patch.object(Agent, "plan_cuts", autospec=True, side_effect=fake_plan_cuts) as mock_plan:
+            results = pipeline._plan_cuts(["a", "b"])
+
+        assert mock_plan.call_args.args[1] == ["a", "b"]
+        assert results[1].data.cut_id == "b"
+
 
 class TestDataLoading:
     """Tests for data loading functionality."""
@@ -244,3 +412,56 @@ class TestDataLoading:
         
         assert len(df) > 0
         assert "Q_NPS" in df.columns
+
+    def test_pyarrow_responses_match_c_parser(self, demo_data_dir, tmp_path):
+        """Test the pyarrow reader returns the C parser's frame, timestamps included."""
+        pytest.importorskip("pyarrow")
+        from dd_agent.orchestrator.pipeline import _read_responses_csv
+
+        responses_path = demo_data_dir / "responses.csv"
+        pd.testing.assert_frame_equal(
+            _read_responses_csv(responses_path), pd.read_csv(responses_path)
+        )
+
+        # pyarrow would parse these as datetime64; the C parser keeps strings
+        timestamps_path = tmp_path / "responses.csv"
+        timestamps_path.write_text("id,submitted_at\n1,2024-01-02 10:00:00\n2,2024-01-03\n")
+        pd.testing.assert_frame_equal(
+            _read_responses_csv(timestamps_path), pd.read_csv(timestamps_path)
+        )
+
+    def test_responses_fall_back_on_parse_error(self, tmp_path):
+        """Test a file the fast parser rejects is read with the C parser."""
+        from dd_agent.orchestrator.pipeline import _read_responses_csv
+
+        responses_path = tmp_path / "responses.csv"
+        responses_path.write_text("id,Q_NPS\n1,9\n2,7\n")
+        read_csv = pd.read_csv
+
+        def strict_read_csv(path, engine=None, **kwargs):
+            if engine == "pyarrow":
+                raise ValueError("CSV parse error")
+            return read_csv(path, **kwargs)
+
+        with patch.object(pd, "read_csv", side_effect=strict_read_csv):
+            df = _read_responses_csv(responses_path)
+
+        assert df["Q_NPS"].tolist() == [9, 7]
+
+
+class TestIntentOrdering:
+    """Tests for autoplan intent ordering."""
+
+    def test_orders_by_priority_keeping_plan_order(self):
+        """Test higher priority intents come first and ties keep plan order."""
+        from dd_agent.contracts.specs import AnalysisIntent
+        from dd_agent.orchestrator.pipeline import _order_intents
+
+        intents = [
+            AnalysisIntent(intent_id=intent_id, description=intent_id, priority=priority)
+            for intent_id, priority in [("a", 3), ("b", 1), ("c", 2), ("d", 1), ("e", 7)]
+        ]
+
+        ordered = _order_intents(intents)
+
+        assert [i.intent_id for i in ordered] == ["b", "d", "c", "a", "e"]
@@ -0,0 +1,43 @@
+"""Tests for dataset hashing."""
+
+import os
+
+from dd_agent.util.hashing import (
+    hash_dataset,
+    hash_dataset_cached,
+    hash_file,
+    hash_file_cached,
+)
+
+
+class TestHashDatasetCached:
+    """Tests for hash_dataset_cached."""
+
+    def test_reuses_digest_until_files_change(self, demo_data_dir, tmp_path):
+        """Test a stored digest is reused and refreshed when a file changes."""
+        questions = demo_data_dir / "questions.json"
+        responses = demo_data_dir / "responses.csv"
+        cache_path = tmp_path / "hash_cache.json"
+
+        digest = hash_dataset_cached(cache_path, questions, responses)
+        assert digest == hash_dataset(questions, responses)
+        assert cache_path.exists()
+
+        # A cache hit does not read the files
+        stat = responses.stat()
+        responses.write_bytes(b"x" * stat.st_size)
+        os.utime(responses, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert hash_dataset_cached(cache_path, questions, responses) == digest
+
+        # A new modification time invalidates the entry
+        os.utime(responses, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert hash_dataset_cached(cache_path, questions, responses) == hash_dataset(
+            questions, responses
+        )
+        assert hash_dataset_cached(cache_path, questions, responses) != digest
+
+    def test_hash_file_cached_matches_hash_file(self, demo_data_dir, tmp_path):
+        """Test the single-file variant returns the plain file digest."""
+        questions = demo_data_dir / "questions.json"
+
+        assert hash_file_cached(tmp_path / "index.json", questions) == hash_file(questions)
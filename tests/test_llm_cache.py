@@ -0,0 +1,86 @@
+"""Tests for the structured LLM response cache and deployment tiers."""
+
+from unittest.mock import MagicMock, patch
+
+from dd_agent.contracts.specs import CutSpec, MetricSpec
+from dd_agent.llm import structured
+from dd_agent.llm.cache import ResponseCache
+from dd_agent.tools.cut_planner import CutPlanResult
+
+
+def _mock_client(plan: CutPlanResult) -> MagicMock:
+    """Build a client whose completions return the given plan as JSON."""
+    response = MagicMock()
+    response.choices[0].message.content = plan.model_dump_json()
+    response.choices[0].finish_reason = "stop"
+    response.usage.prompt_tokens = 100
+    response.usage.completion_tokens = 20
+    response.usage.total_tokens = 120
+    client = MagicMock()
+    client.chat.completions.create.return_value = response
+    return client
+
+
+class TestResponseCache:
+    """Tests for ResponseCache and its use in chat_structured_pydantic."""
+
+    def test_identical_request_skips_llm(self):
+        """Test a repeated request is answered from the cache."""
+        plan = CutPlanResult(
+            ok=True,
+            cut=CutSpec(cut_id="c1", metric=MetricSpec(type="nps", question_id="Q_NPS")),
+        )
+        client = _mock_client(plan)
+        messages = [{"role": "user", "content": "NPS overall"}]
+        cache = ResponseCache(8)
+
+        with patch.object(structured, "get_client", return_value=client), \
+                patch.object(structured, "_response_cache", cache):
+            first, first_trace = structured.chat_structured_pydantic(messages, CutPlanResult)
+            first.cut.cut_id = "changed"
+            first_trace["usage"]["total_tokens"] = -1
+            second, trace = structured.chat_structured_pydantic(messages, CutPlanResult)
+            structured.chat_structured_pydantic(
+                [{"role": "user", "content": "NPS by region"}], CutPlanResult
+            )
+
+        assert client.chat.completions.create.call_count == 2
+        assert trace["cache"] == "hit"
+        assert second.cut.cut_id == "c1"
+        assert first_trace["usage"]["prompt_tokens"] == 100
+        # The stored trace is a copy, unaffected by the caller's edit
+        stored = [entry[1] for entry in cache._entries.values()]
+        assert all(t["usage"]["total_tokens"] == 120 for t in stored)
+
+        # A hit reports no token cost and its own latency
+        assert trace["usage"] == {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        assert trace["latency_s"] < 0.1
+        assert trace["finish_reason"] == "stop"
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache keeps at most max_entries responses."""
+        cache = ResponseCache(2)
+        cache.put("a", "{}", {})
+        cache.put("b", "{}", {})
+        cache.get("a")
+        cache.put("c", "{}", {})
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+
+class TestModelTier:
+    """Tests for routing structured calls to a deployment tier."""
+
+    def test_small_tier_uses_small_deployment(self):
+        """Test the small tier picks the small deployment and falls back without one."""
+        with patch.object(structured.settings, "AZURE_OPENAI_DEPLOYMENT", "big"), \
+                patch.object(structured.settings, "AZURE_OPENAI_SMALL_DEPLOYMENT", "small"):
+            assert structured.resolve_deployment(model_tier="small") == "small"
+            assert structured.resolve_deployment() == "big"
+            assert structured.resolve_deployment("other", model_tier="small") == "other"
+
+        with patch.object(structured.settings, "AZURE_OPENAI_DEPLOYMENT", "big"), \
+                patch.object(structured.settings, "AZURE_OPENAI_SMALL_DEPLOYMENT", ""):
+            assert structured.resolve_deployment(model_tier="small") == "big"
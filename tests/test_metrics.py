@@ -204,3 +204,25 @@ class TestComputeMultiChoiceFrequency:
         
         # Percentages are of respondents (5 total)
         assert result[result["value"] == "B"]["percentage"].iloc[0] == 80.0  # 4/5
+
+
+class TestGroupSums:
+    """Tests for the grouped reduction kernel."""
+
+    def test_loop_matches_bincount(self):
+        """Test the single-pass loop agrees with the NumPy fallback."""
+        import numpy as np
+
+        from dd_agent.engine._kernels import _group_sums_loop, _group_sums_numpy
+
+        codes = np.array([0, 1, -1, 1, 2, 0], dtype=np.int64)
+        flags = np.array([
+            [1, 1, 1, 1, 1, 1],
+            [1, 0, 1, 1, 0, 1],
+        ], dtype=np.float64)
+
+        result = _group_sums_loop(codes, flags, 4)
+
+        assert np.array_equal(result, _group_sums_numpy(codes, flags, 4))
+        assert result[0].tolist() == [2, 2, 1, 0]
+        assert result[1].tolist() == [2, 1, 0, 0]
@@ -0,0 +1,38 @@
+"""Tests for the on-disk plan cache."""
+
+import os
+import time
+
+from dd_agent.contracts.specs import CutSpec, MetricSpec
+from dd_agent.plan_cache import PlanCache, plan_fingerprint
+
+
+class TestPlanCache:
+    """Tests for PlanCache."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test a stored plan is returned for the same fingerprint."""
+        cache = PlanCache(tmp_path, CutSpec)
+        cut = CutSpec(cut_id="c1", metric=MetricSpec(type="nps", question_id="Q_NPS"))
+
+        fingerprint = plan_fingerprint("NPS overall", "data")
+        cache.put(fingerprint, cut)
+
+        assert cache.get(fingerprint) == cut
+        assert cache.get(plan_fingerprint("NPS overall", "other data")) is None
+
+    def test_fingerprint_normalizes_prompt(self):
+        """Test case and surrounding whitespace don't change the key."""
+        assert plan_fingerprint("  NPS Overall ", "d") == plan_fingerprint("nps overall", "d")
+
+    def test_expired_entry_is_dropped(self, tmp_path):
+        """Test entries older than the TTL are not returned."""
+        cache = PlanCache(tmp_path, CutSpec, ttl_s=60)
+        cut = CutSpec(cut_id="c1", metric=MetricSpec(type="nps", question_id="Q_NPS"))
+        cache.put("fp", cut)
+
+        old = time.time() - 120
+        os.utime(tmp_path / "fp.json", (old, old))
+
+        assert cache.get("fp") is None
+        assert not (tmp_path / "fp.json").exists()